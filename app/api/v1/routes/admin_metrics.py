@@ -8,6 +8,7 @@ from app.db.session import get_session
 from app.core.deps import require_admin
 from app.models import User, Entry
 from app.models.payment import Payment
+from app.services.semantic_cache import embedding_cache_stats
 
 
 router = APIRouter()
@@ -390,3 +391,15 @@ def get_revenue_metrics(
         "avg_year_payment": avg_year_payment,
         "mrr_estimate": mrr_estimate,
     }
+
+
+@router.get("/admin/metrics/cache")
+def get_cache_metrics(
+    current_user: User = Depends(require_admin),
+) -> Dict[str, Any]:
+    """
+    Embedding cache counters of the worker process serving this request:
+    - hits / misses: embedding lookups answered from / missing the cache
+    - size / maxsize: cached embeddings and capacity
+    """
+    return {"embedding_cache": embedding_cache_stats()}
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
 from sqlmodel import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
 from app.core.crypto import encrypt_data
@@ -85,61 +85,87 @@ def get_summarizer_service():
     return _summarizer_service
 
 
-def _analyze_entry_sync(
-    entry_id: UUID, content: str, user_id: UUID, data_key: Optional[str] = None
+def _store_entry_analysis_sync(
+    entry_id: UUID,
+    content: str,
+    user_id: UUID,
+    data_key: Optional[str],
+    analysis: dict,
 ):
-    """Synchronous function to analyze entry content and update the database.
+    """Synchronous function to store entry analysis and update the database.
     This runs in a thread pool executor to avoid blocking."""
-    try:
-        # Use lazy-loaded analysis service
-        mood_analysis_service = get_analysis_service()
+    if _try_save_entry_analysis(entry_id, content, user_id, data_key, analysis):
+        # Update user characteristics after entry analysis
+        _refresh_user_characteristics(user_id, data_key)
 
-        # Perform AI analysis
-        analysis = mood_analysis_service.analyze_entry(content)
-
-        # Conditionally summarize entries > 100 words
-        word_count = len(content.split())
-        encrypted_summary = None
-        if word_count > 100:
-            summarizer_service = get_summarizer_service()
-            summary = summarizer_service.summarize_entry(content)
-            print(f"Summary ⚡: {summary}")
-            if summary and data_key:
-                encrypted_summary = encrypt_data(summary, data_key)
-        else:
-            print(f"⏭️ Skipping summarization for short entry ({word_count} words)")
-
-        # Create database session directly
-        from sqlmodel import Session
-        from app.db.session import engine
 
-        with Session(engine) as session:
-            entry = entry_crud.get_entry_by_id(
-                session, entry_id=entry_id, user_id=user_id
-            )
-            if entry:
-                # Skip analysis if entry is a draft
-                if entry.is_draft:
-                    print(f"⏭️ Skipping AI analysis for draft entry {entry_id}")
-                    return
-
-                entry.mood_rating = analysis["mood_rating"]
-                # Always update tags from AI analysis (they reflect the current content)
-                entry.tags = analysis["tags"]
-                entry.encrypted_summary = encrypted_summary
-                entry.ai_processed_at = datetime.utcnow()
-                session.commit()
-                print(f"✅ AI analysis completed for entry {entry_id}")
-
-                # Update user characteristics after entry analysis
-                try:
-                    _update_user_characteristics_sync(user_id, data_key)
-                except Exception as char_error:
-                    print(f"⚠️ Error updating characteristics: {char_error}")
-            else:
-                print(f"❌ Entry {entry_id} not found for analysis")
+def _try_save_entry_analysis(
+    entry_id: UUID,
+    content: str,
+    user_id: UUID,
+    data_key: Optional[str],
+    analysis: dict,
+) -> bool:
+    """Like _save_entry_analysis, but logs errors instead of raising them"""
+    try:
+        return _save_entry_analysis(entry_id, content, user_id, data_key, analysis)
     except Exception as e:
         print(f"❌ Error in background analysis for entry {entry_id}: {e}")
+        return False
+
+
+def _refresh_user_characteristics(user_id: UUID, data_key: Optional[str]):
+    """Update user characteristics, logging errors instead of raising them"""
+    try:
+        _update_user_characteristics_sync(user_id, data_key)
+    except Exception as char_error:
+        print(f"⚠️ Error updating characteristics: {char_error}")
+
+
+def _save_entry_analysis(
+    entry_id: UUID,
+    content: str,
+    user_id: UUID,
+    data_key: Optional[str],
+    analysis: dict,
+) -> bool:
+    """Summarize the entry if needed and store analysis results.
+    Returns True if the entry was updated."""
+    # Conditionally summarize entries > 100 words
+    word_count = len(content.split())
+    encrypted_summary = None
+    if word_count > 100:
+        summarizer_service = get_summarizer_service()
+        summary = summarizer_service.summarize_entry(content)
+        print(f"Summary ⚡: {summary}")
+        if summary and data_key:
+            encrypted_summary = encrypt_data(summary, data_key)
+    else:
+        print(f"⏭️ Skipping summarization for short entry ({word_count} words)")
+
+    # Create database session directly
+    from sqlmodel import Session
+    from app.db.session import engine
+
+    with Session(engine) as session:
+        entry = entry_crud.get_entry_by_id(session, entry_id=entry_id, user_id=user_id)
+        if not entry:
+            print(f"❌ Entry {entry_id} not found for analysis")
+            return False
+
+        # Skip analysis if entry is a draft
+        if entry.is_draft:
+            print(f"⏭️ Skipping AI analysis for draft entry {entry_id}")
+            return False
+
+        entry.mood_rating = analysis["mood_rating"]
+        # Always update tags from AI analysis (they reflect the current content)
+        entry.tags = analysis["tags"]
+        entry.encrypted_summary = encrypted_summary
+        entry.ai_processed_at = datetime.utcnow()
+        session.commit()
+        print(f"✅ AI analysis completed for entry {entry_id}")
+        return True
 
 
 def _update_user_characteristics_sync(user_id: UUID, data_key: str):
@@ -204,24 +230,66 @@ async def analyze_entry_background(
     entry_id: UUID, content: str, user_id: UUID, data_key: Optional[str] = None
 ):
     """Background task to analyze entry content and update the database.
-    Runs the blocking analysis in a thread pool executor for parallel processing."""
-    # Use get_running_loop() for Python 3.7+ (more reliable in async contexts)
-    # Falls back to get_event_loop() if not in a running loop (e.g., called from BackgroundTasks)
+    Sentiment and themes are requested concurrently; the blocking database
+    work runs in a thread pool executor."""
     try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = asyncio.get_event_loop()
+        mood_analysis_service = get_analysis_service()
+        analysis = await mood_analysis_service.analyze_entry_async(
+            content, user_id=user_id
+        )
+    except Exception as e:
+        print(f"❌ Error in background analysis for entry {entry_id}: {e}")
+        return
 
+    loop = asyncio.get_running_loop()
     await loop.run_in_executor(
         _analysis_executor,
-        _analyze_entry_sync,
+        _store_entry_analysis_sync,
         entry_id,
         content,
         user_id,
         data_key,
+        analysis,
     )
 
 
+async def analyze_entries_batch_background(
+    entries: List[Tuple[UUID, str]], user_id: UUID, data_key: Optional[str] = None
+):
+    """Background task to analyze a batch of entries in one pass.
+    The blocking database work runs in a thread pool executor."""
+    try:
+        mood_analysis_service = get_analysis_service()
+        analyses = await mood_analysis_service.analyze_entries_async(
+            [content for _, content in entries], user_id=user_id
+        )
+    except Exception as e:
+        print(f"❌ Error in batch analysis for user {user_id}: {e}")
+        return
+
+    # Summarize and store each entry on its own executor thread, then refresh
+    # user characteristics once for the whole batch
+    loop = asyncio.get_running_loop()
+    saved = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                _analysis_executor,
+                _try_save_entry_analysis,
+                entry_id,
+                content,
+                user_id,
+                data_key,
+                analysis,
+            )
+            for (entry_id, content), analysis in zip(entries, analyses)
+        )
+    )
+    if any(saved):
+        await loop.run_in_executor(
+            _analysis_executor, _refresh_user_characteristics, user_id, data_key
+        )
+
+
 @router.post("/", response_model=EntryResponse, status_code=status.HTTP_201_CREATED)
 def create_entry(
     entry_data: EntryCreate,
@@ -329,21 +397,19 @@ async def create_entries_batch(
         entries_data=entries_data,
     )
 
-    # Schedule background tasks for non-draft entries asynchronously
-    # Use asyncio.create_task to run them in parallel without blocking the response
-    for original_index, entry in created_entries_with_indices:
-        entry_data = batch_data.entries[original_index]
-        if not entry_data.is_draft:
-            # Create task to run analysis in parallel (fire and forget)
-            # Tasks will run concurrently in the thread pool executor
-            asyncio.create_task(
-                analyze_entry_background(
-                    entry.id,
-                    original_contents[original_index],
-                    current_user.id,
-                    data_key,
-                )
+    # Schedule one background task analyzing all non-draft entries together
+    # Use asyncio.create_task so it runs without blocking the response
+    entries_to_analyze = [
+        (entry.id, original_contents[original_index])
+        for original_index, entry in created_entries_with_indices
+        if not batch_data.entries[original_index].is_draft
+    ]
+    if entries_to_analyze:
+        asyncio.create_task(
+            analyze_entries_batch_background(
+                entries_to_analyze, current_user.id, data_key
             )
+        )
 
     # Build response with decrypted data
     response_entries = [
@@ -996,7 +1062,9 @@ def trigger_ai_analysis(entry_id: str):
         data_key = get_user_data_key(session, user_id=entry.user_id)
         decrypted_content = decrypt_data(entry.encrypted_content, data_key)
 
-        analysis = mood_analysis_service.analyze_entry(decrypted_content)
+        analysis = mood_analysis_service.analyze_entry(
+            decrypted_content, user_id=entry.user_id
+        )
 
         entry.mood_rating = analysis["mood_rating"]
         entry.tags = analysis["tags"]
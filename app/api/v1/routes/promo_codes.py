@@ -214,9 +214,7 @@ def redeem_promo_code(
 
         current_user.plan = promo_code.plan
         current_user.plan_started_at = now
-        current_user.plan_expires_at = now + timedelta(
-            days=plan_config["duration_days"]
-        )
+        current_user.plan_expires_at = now + timedelta(days=plan_config.duration_days)
         current_user.subscription_status = "active"
 
         # Create subscription record
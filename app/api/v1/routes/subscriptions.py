@@ -2,6 +2,7 @@
 API routes for subscription management and payments.
 """
 
+from dataclasses import asdict
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel import Session
 from datetime import datetime, timedelta
@@ -41,11 +42,11 @@ def get_available_plans():
     plans = [
         PlanResponse(
             id=plan_id,
-            name=config["name"],
-            price_monthly=config["price_monthly"],
-            price_yearly=config["price_yearly"],
-            duration_days=config["duration_days"],
-            features=config["features"],
+            name=config.name,
+            price_monthly=config.price_monthly,
+            price_yearly=config.price_yearly,
+            duration_days=config.duration_days,
+            features=asdict(config.features),
         )
         for plan_id, config in PLAN_CONFIG.items()
     ]
@@ -63,12 +64,12 @@ def get_current_subscription(
     plan_config = get_plan_config(current_user.plan)
     return SubscriptionResponse(
         plan=current_user.plan,
-        plan_name=plan_config["name"],
+        plan_name=plan_config.name,
         status=current_user.subscription_status,
         started_at=current_user.plan_started_at,
         expires_at=current_user.plan_expires_at,
         trial_used=current_user.trial_used,
-        features=plan_config["features"],
+        features=asdict(plan_config.features),
         is_active=is_plan_active(current_user),
     )
 
@@ -94,7 +95,7 @@ def start_trial(
         )
 
     # Set trial plan
-    trial_duration = PLAN_CONFIG["trial"]["duration_days"]
+    trial_duration = PLAN_CONFIG["trial"].duration_days
     now = datetime.utcnow()
 
     current_user.plan = "trial"
@@ -165,7 +166,7 @@ def initiate_subscription(
         payment_response = webkassa_service.create_payment_order(
             amount=amount,
             user_email=current_user.email,
-            plan_name=plan_config["name"],
+            plan_name=plan_config.name,
             order_id=order_id,
         )
 
@@ -233,7 +234,7 @@ async def webkassa_webhook(
     if payment_status == "success":
         try:
             # Issue fiscal receipt
-            receipt = webkassa_service.issue_fiscal_receipt(
+            receipt = await webkassa_service.aissue_fiscal_receipt(
                 order_id=order_id,
                 amount=payment.amount,
                 user_email=payment.user.email,
@@ -247,7 +248,7 @@ async def webkassa_webhook(
 
             user.plan = payment.plan
             user.plan_started_at = now
-            user.plan_expires_at = now + timedelta(days=plan_config["duration_days"])
+            user.plan_expires_at = now + timedelta(days=plan_config.duration_days)
             user.subscription_status = "active"
 
             # Create subscription record
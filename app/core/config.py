@@ -32,9 +32,47 @@ class Settings:
         self.master_encryption_key: str = os.getenv(
             "MASTER_ENCRYPTION_KEY", "your-master-encryption-key-change-in-production"
         )
-        self.hf_token: str = os.getenv("HF_TOKEN", "your-huggingface-token")
         self.openai_api_key: str = os.getenv("OPENAI_API_KEY", "your-openai-api-key")
 
+        # LLM response cache
+        self.llm_cache_max_entries: int = int(
+            os.getenv("LLM_CACHE_MAX_ENTRIES", "10000")
+        )
+        self.llm_cache_ttl_seconds: int = int(
+            os.getenv("LLM_CACHE_TTL_SECONDS", "86400")
+        )
+
+        # Opt-in: entries with fewer meaningful words than this get a sentiment-only
+        # request and no themes (0, the default, always extracts themes)
+        self.theme_min_words: int = int(os.getenv("THEME_MIN_WORDS", "0"))
+
+        # Semantic cache: reuse results for near-duplicate entries (opt-in)
+        self.semantic_cache_enabled: bool = (
+            os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+        )
+        self.semantic_cache_threshold: float = float(
+            os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92")
+        )
+        self.semantic_cache_max_entries: int = int(
+            os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "5000")
+        )
+        self.semantic_cache_ttl_seconds: int = int(
+            os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "86400")
+        )
+        # Embed entries with a local ONNX model instead of the OpenAI API; the
+        # similarity threshold may need retuning for the different embedding space
+        self.use_local_embeddings: bool = (
+            os.getenv("USE_LOCAL_EMBEDDINGS", "false").lower() == "true"
+        )
+
+        # OpenAI account rate limits used by bulk parallel processing
+        self.openai_max_requests_per_minute: int = int(
+            os.getenv("OPENAI_MAX_REQUESTS_PER_MINUTE", "500")
+        )
+        self.openai_max_tokens_per_minute: int = int(
+            os.getenv("OPENAI_MAX_TOKENS_PER_MINUTE", "200000")
+        )
+
         # GOOGLE AUTH
         self.google_client_id: str = os.getenv(
             "GOOGLE_CLIENT_ID", "your-google-client-id"
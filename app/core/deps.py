@@ -2,6 +2,7 @@
 Dependencies for FastAPI routes.
 """
 
+from datetime import datetime
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlmodel import Session
@@ -9,7 +10,7 @@ from app.db.session import get_session
 from app.models import User
 from app.core.security import verify_token
 from app.crud import user as user_crud
-from app.services.plan_service import can_use_feature, is_plan_active
+from app.services.plan_service import Feature, can_use_feature, is_plan_active
 
 security = HTTPBearer()
 
@@ -52,14 +53,14 @@ def get_current_user(
     return user
 
 
-def require_pro_feature(feature: str):
+def require_pro_feature(feature: Feature | str):
     """
     Dependency factory to require a Pro feature.
 
     Usage:
         @router.get("/some-endpoint")
         def some_endpoint(
-            current_user: User = Depends(require_pro_feature("has_themes"))
+            current_user: User = Depends(require_pro_feature(Feature.THEMES))
         ):
             ...
 
@@ -74,8 +75,9 @@ def require_pro_feature(feature: str):
         current_user: User = Depends(get_current_user),
         session: Session = Depends(get_session),
     ) -> User:
-        if not is_plan_active(current_user) or not can_use_feature(
-            current_user, feature
+        now = datetime.utcnow()
+        if not is_plan_active(current_user, now=now) or not can_use_feature(
+            current_user, feature, now=now
         ):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
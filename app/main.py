@@ -1,10 +1,14 @@
+import asyncio
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.db.session import create_db_and_tables
 from app.api.v1.deps import api_router
+from app.api.v1.routes.entries import get_analysis_service
+from app.services.openai_client import shared_client, shared_sync_client
+from app.services.webkassa_service import webkassa_service
 from datetime import datetime
 from pathlib import Path
 
@@ -15,6 +19,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -35,8 +40,41 @@ templates = Jinja2Templates(directory=str(Path(__file__).parent / "templates"))
 
 @app.on_event("startup")
 def startup_event():
-    """Initialize database on startup"""
+    """Initialize database and AI services on startup"""
     create_db_and_tables()
+    # Build analysis clients once per worker so the first request doesn't pay for it
+    get_analysis_service()
+
+
+_WARMUP_TIMEOUT_SECONDS = 5.0
+
+
+@app.on_event("startup")
+async def warmup_openai_clients():
+    """Open the OpenAI connections (DNS + TLS) before the first real request"""
+    # Best effort: no retries and a hard cap, so an unreachable API or a bad key
+    # can't hold up startup. The copies share the shared clients' pools.
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(
+                shared_client.with_options(max_retries=0).models.list(),
+                asyncio.to_thread(
+                    shared_sync_client.with_options(max_retries=0).models.list
+                ),
+            ),
+            timeout=_WARMUP_TIMEOUT_SECONDS,
+        )
+    except Exception as e:
+        print(f"OpenAI client warm-up failed: {e}")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close shared HTTP connection pools"""
+    await shared_client.close()
+    shared_sync_client.close()
+    webkassa_service.close()
+    await webkassa_service.aclose()
 
 
 @app.get("/health", response_class=HTMLResponse)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Script to re-run AI analysis (sentiment + themes) for all existing entries.
+
+Usage:
+    python -m app.scripts.reanalyze_entries                   # analyze now
+    python -m app.scripts.reanalyze_entries --use-batch-api   # submit OpenAI batch
+    python -m app.scripts.reanalyze_entries --collect <batch_id>
+
+The batch API path is half the cost but may take up to 24h; run --collect
+with the printed batch ID once the batch has completed.
+"""
+from app.core.crypto import decrypt_data
+from app.services.encryption_key_service import get_user_data_key
+from app.services.analysis_batch_job import AnalysisBatchJob
+from app.services.entry_analysis_service import MoodAnalysisService
+from app.models import Entry
+from app.db.session import engine
+from sqlmodel import Session, select
+from datetime import datetime
+from uuid import UUID
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+
+def _load_entries(session: Session) -> list[tuple[str, str]]:
+    """Load and decrypt all non-draft entries as (entry_id, content) tuples,
+    skipping users without an encryption key"""
+    entries = session.exec(select(Entry).where(Entry.is_draft.is_(False))).all()
+    data_keys = {}
+    result = []
+    for entry in entries:
+        if entry.user_id not in data_keys:
+            try:
+                data_keys[entry.user_id] = get_user_data_key(
+                    session, user_id=entry.user_id
+                )
+            except ValueError as e:
+                print(f"⚠️ Skipping entries of user {entry.user_id}: {e}")
+                data_keys[entry.user_id] = None
+        if data_keys[entry.user_id] is None:
+            continue
+        content = decrypt_data(entry.encrypted_content, data_keys[entry.user_id])
+        result.append((str(entry.id), content))
+    return result
+
+
+def _store_results(session: Session, results: dict[str, dict]) -> int:
+    """Write mood ratings and tags to entries, returning how many were updated"""
+    updated = 0
+    for entry_id, analysis in results.items():
+        entry = session.get(Entry, UUID(entry_id))
+        if entry is None or entry.is_draft:
+            continue
+        entry.mood_rating = analysis["mood_rating"]
+        entry.tags = analysis["tags"]
+        entry.ai_processed_at = datetime.utcnow()
+        updated += 1
+    session.commit()
+    return updated
+
+
+def reanalyze_entries(use_batch_api: bool = False):
+    """Analyze all entries now, or submit them as an OpenAI batch"""
+    print("🚀 Starting entry re-analysis...")
+
+    with Session(engine) as session:
+        entries = _load_entries(session)
+        print(f"📊 Found {len(entries)} entries")
+        if not entries:
+            return
+
+        if use_batch_api:
+            batch_id = AnalysisBatchJob().submit(entries)
+            print(f"📤 Submitted batch {batch_id}")
+            print(f"   Collect with: --collect {batch_id}")
+            return
+
+        # Async path: requests go through the rate-limited parallel processor
+        analyses = asyncio.run(
+            MoodAnalysisService().analyze_entries_async(
+                [content for _, content in entries]
+            )
+        )
+        results = {
+            entry_id: analysis for (entry_id, _), analysis in zip(entries, analyses)
+        }
+        updated = _store_results(session, results)
+        print(f"✅ Updated {updated} entries")
+
+
+def collect_batch(batch_id: str):
+    """Store results of a completed OpenAI batch"""
+    job = AnalysisBatchJob()
+    results = job.fetch_results(batch_id)
+    if results is None:
+        print(f"⏳ Batch {batch_id} is not completed yet: {job.get_status(batch_id)}")
+        return
+
+    with Session(engine) as session:
+        updated = _store_results(
+            session,
+            {
+                entry_id: {"mood_rating": analysis.score, "tags": analysis.themes}
+                for entry_id, analysis in results.items()
+            },
+        )
+    print(f"✅ Updated {updated} entries from batch {batch_id}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-run AI analysis for entries")
+    parser.add_argument(
+        "--use-batch-api",
+        action="store_true",
+        help="Submit entries through the OpenAI Batch API instead of analyzing now",
+    )
+    parser.add_argument("--collect", metavar="BATCH_ID", help="Collect batch results")
+    args = parser.parse_args()
+
+    if args.collect:
+        collect_batch(args.collect)
+    else:
+        reanalyze_entries(use_batch_api=args.use_batch_api)
@@ -1,9 +1,8 @@
 from datetime import date, datetime
 from typing import List, Optional
 from uuid import UUID
-import openai
 from sqlmodel import Session
-from app.core.config import settings
+from app.services.openai_client import long_running_sync_client
 from app.models.entry import Entry
 from app.crud import entry as entry_crud
 from app.crud import insight as insight_crud
@@ -15,7 +14,7 @@ import json
 
 class AIInsightsService:
     def __init__(self):
-        self.client = openai.OpenAI(api_key=settings.openai_api_key)
+        self.client = long_running_sync_client
         self.mini_model = "gpt-4o-mini"
         self.pro_model = "gpt-4o"
 
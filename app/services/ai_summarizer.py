@@ -1,11 +1,10 @@
-import openai
 from typing import Optional
-from app.core.config import settings
+from app.services.openai_client import shared_sync_client
 
 
 class AISummarizerService:
     def __init__(self):
-        self.client = openai.OpenAI(api_key=settings.openai_api_key)
+        self.client = shared_sync_client
         self.model = "gpt-4o-mini"  # Use mini for cost efficiency
 
     def summarize_entry(self, entry_text: str, max_words: int = 100) -> Optional[str]:
@@ -0,0 +1,113 @@
+"""
+Offline entry analysis through the OpenAI Batch API.
+
+Batch requests are billed at half the price of real-time calls and use a
+separate rate-limit pool, at the cost of up to 24h latency. Use this for
+backfills and reprocessing, never for interactive requests.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import orjson
+from app.services.combined_analyzer import CombinedAnalyzer, EntryAnalysis
+from app.services.theme_extraction_service import (
+    default_max_themes,
+    is_too_short_for_themes,
+)
+
+# Upper bound on themes kept from a batch reply; the prompt already asks
+# for the per-entry count, this only guards against overlong replies
+_MAX_THEMES = 4
+
+
+class AnalysisBatchJob:
+    """Submits entry analysis requests as an OpenAI batch and collects results"""
+
+    def __init__(self):
+        self.analyzer = CombinedAnalyzer()
+        self.client = self.analyzer.client
+
+    def submit(self, entries: List[Tuple[str, str]]) -> str:
+        """
+        Submit entries for analysis.
+
+        Args:
+            entries: List of (entry_id, decrypted content) tuples
+
+        Returns:
+            OpenAI batch ID to poll with get_status / fetch_results
+        """
+        lines = []
+        for entry_id, content in entries:
+            # Same routing as CombinedAnalyzer: too short entries only get a score,
+            # which parse_analysis reads back with an empty theme list
+            if is_too_short_for_themes(content):
+                body = self.analyzer.sentiment_analyzer.request_kwargs(content)
+            else:
+                body = self.analyzer.request_kwargs(
+                    content, default_max_themes(content)
+                )
+            lines.append(
+                orjson.dumps(
+                    {
+                        "custom_id": str(entry_id),
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": body,
+                    }
+                )
+            )
+
+        input_file = self.client.files.create(
+            file=("entry_analysis.jsonl", b"\n".join(lines)), purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+
+    def get_status(self, batch_id: str) -> str:
+        """Get the batch status ("validating", "in_progress", "completed", ...)"""
+        return self.client.batches.retrieve(batch_id).status
+
+    def fetch_results(self, batch_id: str) -> Optional[Dict[str, EntryAnalysis]]:
+        """
+        Download results of a completed batch.
+
+        Returns:
+            Mapping of entry_id to analysis, or None if the batch is not completed.
+            Entries whose request failed are omitted; their errors are in the
+            batch's error file, whose ID is printed.
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status != "completed":
+            return None
+        if batch.error_file_id:
+            print(
+                f"⚠️ Batch {batch_id} has failed requests, see error file "
+                f"{batch.error_file_id}"
+            )
+        if not batch.output_file_id:
+            # Every request failed, so there is nothing to collect
+            print(f"❌ Batch {batch_id} completed without any successful results")
+            return {}
+
+        output = self.client.files.content(batch.output_file_id)
+        results = {}
+        for line in output.content.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                print(f"❌ Batch request {record.get('custom_id')} failed: {record}")
+                continue
+            try:
+                content = response["body"]["choices"][0]["message"]["content"]
+                results[record["custom_id"]] = self.analyzer.parse_analysis(
+                    content, _MAX_THEMES
+                )
+            except Exception as e:
+                print(f"❌ Error parsing batch result {record.get('custom_id')}: {e}")
+        return results
@@ -1,3 +1,4 @@
+from collections import Counter
 from datetime import date, datetime, timezone, timedelta
 from typing import Optional
 from uuid import UUID
@@ -89,38 +90,33 @@ class AnalyticsService:
         return main_themes
 
     def _get_main_themes(self, entries):
-        themes = {}
-        total_tags = 0
+        themes = Counter()
         for entry in entries:
             if entry.tags is not None:
-                for tag in entry.tags:
-                    themes[tag] = themes.get(tag, 0) + 1
-                    total_tags += 1
+                themes.update(entry.tags)
+        total_tags = themes.total()
 
         # Avoid division by zero
         if total_tags == 0:
             return []
 
-        # Prepare list of dicts with frequency and relative percentage
-        result = []
-        for tag, frequency in sorted(themes.items(), key=lambda x: x[1], reverse=True):
-            relative_percentage = int(round((frequency / total_tags) * 100))
-            result.append(
-                {
-                    "tag": tag,
-                    "frequency": frequency,
-                    "relative_percentage": relative_percentage,
-                }
-            )
-        return result[:5]
+        # Prepare list of dicts with frequency and relative percentage for the top 5
+        return [
+            {
+                "tag": tag,
+                "frequency": frequency,
+                "relative_percentage": int(round((frequency / total_tags) * 100)),
+            }
+            for tag, frequency in themes.most_common(5)
+        ]
 
-    def _sort_entries_by_mood_rating(self, entries):
-        sorted_entries = sorted(
-            entries,
-            key=lambda x: x.mood_rating if x.mood_rating is not None else 0,
-            reverse=True,
-        )
-        return sorted_entries
+    def _best_and_worst_entries(self, entries):
+        # Two linear scans instead of a full sort; ties resolve as the stable
+        # descending sort did (first highest, last lowest)
+        def key(x):
+            return x.mood_rating if x.mood_rating is not None else 0
+
+        return max(entries, key=key), min(reversed(entries), key=key)
 
     def get_best_and_worst_entries_by_mood_rating(
         self,
@@ -136,9 +132,7 @@ class AnalyticsService:
         if not entries:
             return []
 
-        sorted_entries = self._sort_entries_by_mood_rating(entries)
-        best_entry = sorted_entries[0]
-        worst_entry = sorted_entries[-1]
+        best_entry, worst_entry = self._best_and_worst_entries(entries)
 
         return {
             "best_entry": {
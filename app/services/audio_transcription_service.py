@@ -1,14 +1,13 @@
-import openai
 import tempfile
 import os
 from fastapi import UploadFile
-from app.core.config import settings
+from app.services.openai_client import long_running_sync_client
 
 
 class AudioTranscriptionService:
     def __init__(self):
         """Initialize OpenAI client for Whisper API"""
-        self.client = openai.OpenAI(api_key=settings.openai_api_key)
+        self.client = long_running_sync_client
 
     async def transcribe_audio(self, audio_file: UploadFile) -> str:
         """
@@ -1,14 +1,13 @@
-import openai
 import json
 from typing import Dict, Any, List
-from app.core.config import settings
+from app.services.openai_client import long_running_sync_client
 
 
 class CharacteristicGeneratorService:
     """Service to generate user characteristics based on their diary entries"""
 
     def __init__(self):
-        self.client = openai.OpenAI(api_key=settings.openai_api_key)
+        self.client = long_running_sync_client
         self.model = "gpt-4o-mini"  # Use mini for cost efficiency
 
     def generate_characteristics(
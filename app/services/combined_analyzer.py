@@ -0,0 +1,275 @@
+"""
+Combined sentiment and theme analysis of a diary entry in a single LLM call.
+"""
+
+import openai
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional
+from uuid import UUID
+from app.core.config import settings
+from app.services.openai_client import shared_client, shared_sync_client
+from app.services.llm_cache import llm_cache
+from app.services.openai_parallel import ParallelRequestProcessor, estimate_tokens
+from app.services.semantic_cache import (
+    aget_embedding,
+    analysis_semantic_cache,
+    aprefetch_embeddings,
+    get_embedding,
+    prefetch_embeddings,
+)
+from app.services.sentiment_service import (
+    SENTIMENT_SCORING_GUIDE,
+    MultilingualSentimentAnalyzer,
+)
+from app.services.theme_extraction_service import (
+    default_max_themes,
+    is_too_short_for_themes,
+)
+
+
+_SYSTEM_PROMPT = (
+    """You are an expert multilingual analyst of personal diary and journal entries.
+
+For each entry you rate its sentiment with a precise numerical score with exactly 2 decimal places, and extract its most relevant themes.
+
+"""
+    + SENTIMENT_SCORING_GUIDE
+    + """
+
+## Theme Extraction
+- Extract the requested number of themes that best represent the main topics, emotions, or subjects in the entry
+- Generate concise, descriptive theme names (1-3 words each)
+- Themes must be in the same language as the diary entry
+- Consider emotions, activities, relationships, topics, and experiences mentioned
+
+## Response Format
+Respond with ONLY a valid JSON object:
+{"sentiment_score": <float between -2.00 and 2.00 with 2 decimal places>, "themes": ["theme1", "theme2", ...]}"""
+)
+
+# Structured output schema covering both fields of the combined response
+ANALYSIS_SCHEMA = {
+    "name": "entry_analysis",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "sentiment_score": {"type": "number", "minimum": -2, "maximum": 2},
+            "themes": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["sentiment_score", "themes"],
+        "additionalProperties": False,
+    },
+}
+
+
+@dataclass
+class EntryAnalysis:
+    """Sentiment score and themes of a single entry."""
+
+    score: float = 0.0
+    themes: List[str] = field(default_factory=list)
+
+    def copy(self, max_themes: Optional[int] = None) -> "EntryAnalysis":
+        """Independent copy, optionally keeping only the first max_themes themes."""
+        return EntryAnalysis(score=self.score, themes=self.themes[:max_themes])
+
+
+class CombinedAnalyzer:
+    """Rates sentiment and extracts themes of an entry with one GPT-4o-mini request"""
+
+    def __init__(
+        self,
+        client: Optional[openai.OpenAI] = None,
+        async_client: Optional[openai.AsyncOpenAI] = None,
+    ):
+        self.client = client or shared_sync_client
+        self.async_client = async_client or shared_client
+        self.model = "gpt-4o-mini"
+        # Very short entries only get a (cheaper) sentiment-only request
+        self.sentiment_analyzer = MultilingualSentimentAnalyzer(
+            self.client, self.async_client
+        )
+
+    def request_kwargs(self, text: str, max_themes: int) -> dict:
+        """Build the chat completion request for a single entry"""
+        user_prompt = f"""Analyze the following diary entry. Provide its sentiment score and exactly {max_themes} themes.
+
+Diary entry:
+\"\"\"
+{text}
+\"\"\""""
+
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt},
+            ],
+            "response_format": {"type": "json_schema", "json_schema": ANALYSIS_SCHEMA},
+            "temperature": 0.1,  # Low temperature for consistent, cacheable results
+            "max_tokens": 200,
+        }
+
+    def parse_analysis(self, response_content: str, max_themes: int) -> EntryAnalysis:
+        """Parse and validate both fields of the model's JSON response"""
+        result = orjson.loads(response_content)
+
+        try:
+            score = float(result["sentiment_score"])
+        except (KeyError, TypeError, ValueError):
+            score = 0.0
+        # Clamp the score to valid range [-2, 2]
+        score = round(max(-2.0, min(2.0, score)), 2)
+
+        themes = result.get("themes")
+        if not isinstance(themes, list):
+            themes = []
+        valid_themes = [
+            str(theme).strip().lower()
+            for theme in themes
+            if theme and str(theme).strip()
+        ]
+
+        return EntryAnalysis(score=score, themes=valid_themes[:max_themes])
+
+    def analyze(self, text: str, user_id: Optional[UUID] = None) -> EntryAnalysis:
+        """
+        Analyze sentiment and themes of an entry synchronously.
+
+        The semantic cache is only consulted when user_id is given, and only
+        matches earlier entries of that same user.
+        """
+        if is_too_short_for_themes(text):
+            return EntryAnalysis(
+                score=self.sentiment_analyzer.analyze_sentiment_sync(text)
+            )
+        max_themes = default_max_themes(text)
+        try:
+            request = self.request_kwargs(text, max_themes)
+            cache_key = llm_cache.make_key(request)
+            response_content = llm_cache.get(cache_key)
+            embedding = None
+            if response_content is None:
+                if settings.semantic_cache_enabled and user_id is not None:
+                    embedding = get_embedding(self.client, text)
+                    cached_analysis = analysis_semantic_cache.lookup(
+                        embedding, owner=user_id
+                    )
+                    if cached_analysis is not None:
+                        return cached_analysis.copy(max_themes)
+
+                response = self.client.chat.completions.create(**request)
+                response_content = response.choices[0].message.content
+
+            analysis = self.parse_analysis(response_content, max_themes)
+            llm_cache.set(cache_key, response_content)
+            if embedding is not None:
+                analysis_semantic_cache.add(embedding, analysis.copy(), owner=user_id)
+            return analysis
+
+        except orjson.JSONDecodeError as e:
+            print(f"Error parsing JSON response from OpenAI: {e}")
+            return EntryAnalysis()
+        except Exception as e:
+            print(f"Error in entry analysis: {e}")
+            return EntryAnalysis()
+
+    async def _analyze_async(
+        self,
+        text: str,
+        user_id: Optional[UUID] = None,
+        client: Optional[openai.AsyncOpenAI] = None,
+    ) -> EntryAnalysis:
+        """
+        Analyze an entry asynchronously, raising on any error.
+
+        client overrides self.async_client, e.g. with one that doesn't retry.
+        """
+        client = client or self.async_client
+        if is_too_short_for_themes(text):
+            return EntryAnalysis(
+                score=await self.sentiment_analyzer.analyze_sentiment_or_raise(
+                    text, client
+                )
+            )
+        max_themes = default_max_themes(text)
+        request = self.request_kwargs(text, max_themes)
+        cache_key = llm_cache.make_key(request)
+        response_content = llm_cache.get(cache_key)
+        embedding = None
+        if response_content is None:
+            if settings.semantic_cache_enabled and user_id is not None:
+                embedding = await aget_embedding(client, text)
+                cached_analysis = analysis_semantic_cache.lookup(
+                    embedding, owner=user_id
+                )
+                if cached_analysis is not None:
+                    return cached_analysis.copy(max_themes)
+
+            response = await client.chat.completions.create(**request)
+            response_content = response.choices[0].message.content
+
+        analysis = self.parse_analysis(response_content, max_themes)
+        llm_cache.set(cache_key, response_content)
+        if embedding is not None:
+            analysis_semantic_cache.add(embedding, analysis.copy(), owner=user_id)
+        return analysis
+
+    async def analyze_async(
+        self, text: str, user_id: Optional[UUID] = None
+    ) -> EntryAnalysis:
+        """Analyze sentiment and themes of an entry asynchronously"""
+        try:
+            return await self._analyze_async(text, user_id)
+
+        except orjson.JSONDecodeError as e:
+            print(f"Error parsing JSON response from OpenAI: {e}")
+            return EntryAnalysis()
+        except Exception as e:
+            print(f"Error in entry analysis: {e}")
+            return EntryAnalysis()
+
+    def analyze_batch(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        user_id: Optional[UUID] = None,
+    ) -> List[EntryAnalysis]:
+        """Analyze many entries of one user, up to batch_size requests in flight"""
+        if not texts:
+            return []
+        if settings.semantic_cache_enabled and user_id is not None:
+            prefetch_embeddings(self.client, texts)
+
+        with ThreadPoolExecutor(max_workers=min(batch_size, len(texts))) as executor:
+            return list(executor.map(lambda text: self.analyze(text, user_id), texts))
+
+    async def batch_analyze(
+        self,
+        texts: List[str],
+        concurrency: int = 10,
+        user_id: Optional[UUID] = None,
+    ) -> List[EntryAnalysis]:
+        """Analyze many entries of one user concurrently within the rate limits"""
+        if settings.semantic_cache_enabled and user_id is not None and texts:
+            await aprefetch_embeddings(self.async_client, texts)
+        processor = ParallelRequestProcessor(max_workers=concurrency)
+        # The processor requeues failed requests itself; SDK retries on top of
+        # that would multiply attempts and bypass its rate limit pause
+        client = self.async_client.with_options(max_retries=0)
+        analyses = await processor.run(
+            texts,
+            lambda text: self._analyze_async(text, user_id, client),
+            lambda text: estimate_tokens(
+                self.request_kwargs(text, default_max_themes(text))
+            ),
+            default=None,
+        )
+        # Entries that kept failing get their own neutral result
+        return [
+            analysis if analysis is not None else EntryAnalysis()
+            for analysis in analyses
+        ]
@@ -1,27 +1,53 @@
-from app.services.sentiment_service import MultilingualSentimentAnalyzer
-from app.services.theme_extraction_service import theme_extraction_service
+from typing import List, Optional
+from uuid import UUID
+from app.services.combined_analyzer import CombinedAnalyzer, EntryAnalysis
 
 
 class MoodAnalysisService:
     """Complete mood analysis service combining sentiment and theme extraction"""
 
     def __init__(self):
-        self.sentiment_analyzer = MultilingualSentimentAnalyzer()
-        self.theme_extractor = theme_extraction_service
+        # Sentiment and themes come from a single combined request per entry
+        self.analyzer = CombinedAnalyzer()
 
-    def analyze_entry(self, content: str) -> dict:
-        """Complete analysis: sentiment + themes"""
-        try:
-            # Analyze sentiment
-            mood_rating = self.sentiment_analyzer.analyze_sentiment_sync(content)
-        except Exception as e:
-            print(f"Error in sentiment analysis: {e}")
-            mood_rating = 0.0  # Default neutral mood
-
-        # Extract themes
-        themes = self.theme_extractor.extract_themes(content)
+    def _to_dict(self, analysis: EntryAnalysis) -> dict:
+        return {"mood_rating": analysis.score, "tags": analysis.themes}
 
-        return {"mood_rating": mood_rating, "tags": themes}
+    def analyze_entry(self, content: str, user_id: Optional[UUID] = None) -> dict:
+        """Complete analysis: sentiment + themes"""
+        return self.analyze_entries([content], user_id=user_id)[0]
+
+    def analyze_entries(
+        self,
+        contents: List[str],
+        batch_size: int = 32,
+        user_id: Optional[UUID] = None,
+    ) -> List[dict]:
+        """Complete analysis for many entries at once: sentiment + themes"""
+        analyses = self.analyzer.analyze_batch(
+            contents, batch_size=batch_size, user_id=user_id
+        )
+        return [self._to_dict(analysis) for analysis in analyses]
+
+    async def analyze_entry_async(
+        self, content: str, user_id: Optional[UUID] = None
+    ) -> dict:
+        """Complete analysis of one entry without blocking the event loop"""
+        # A single request doesn't need the parallel processor; the retrying
+        # client backs off on its own
+        return self._to_dict(await self.analyzer.analyze_async(content, user_id))
+
+    async def analyze_entries_async(
+        self,
+        contents: List[str],
+        concurrency: int = 10,
+        user_id: Optional[UUID] = None,
+    ) -> List[dict]:
+        """Complete analysis for many entries, overlapping all OpenAI requests"""
+        analyses = await self.analyzer.batch_analyze(
+            contents, concurrency=concurrency, user_id=user_id
+        )
+        return [self._to_dict(analysis) for analysis in analyses]
 
 
 # Services are now created lazily when needed
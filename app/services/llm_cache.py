@@ -0,0 +1,54 @@
+"""
+Exact-match cache for LLM chat completion responses.
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Optional
+from cachetools import TTLCache
+from app.core.config import settings
+
+
+class LLMCache:
+    """In-process cache of chat completion content keyed by the request payload."""
+
+    def __init__(self, maxsize: int = 10_000, ttl: int = 86400):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """
+        Build a cache key from the parts of a request that determine the response.
+
+        Args:
+            request: Keyword arguments passed to chat.completions.create
+
+        Returns:
+            SHA-256 hex digest of model, messages, temperature and response format
+        """
+        payload = {
+            "model": request.get("model"),
+            "messages": request.get("messages"),
+            "temperature": request.get("temperature"),
+            "response_format": request.get("response_format"),
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get cached response content, or None on a miss."""
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key: str, value: str) -> None:
+        """Store response content under key."""
+        with self._lock:
+            self._cache[key] = value
+
+
+# Global cache instance
+llm_cache = LLMCache(
+    maxsize=settings.llm_cache_max_entries, ttl=settings.llm_cache_ttl_seconds
+)
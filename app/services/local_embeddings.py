@@ -0,0 +1,86 @@
+"""
+Optional local sentence embeddings with ONNX Runtime.
+
+When settings.use_local_embeddings is on, the semantic cache embeds entries
+on CPU with a multilingual MiniLM model instead of calling the OpenAI
+embeddings API. Requires the optional onnxruntime, tokenizers and
+huggingface_hub packages; model files are downloaded once into the Hugging
+Face cache on first use.
+"""
+
+import threading
+from typing import List, Optional
+import numpy as np
+
+LOCAL_EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+_MAX_TOKENS = 128
+
+
+class LocalEmbedder:
+    """Mean-pooled, L2-normalized sentence embeddings from an ONNX model."""
+
+    def __init__(self, model_id: str = LOCAL_EMBEDDING_MODEL):
+        import onnxruntime as ort
+        from huggingface_hub import hf_hub_download
+        from tokenizers import Tokenizer
+
+        self.tokenizer = Tokenizer.from_file(
+            hf_hub_download(model_id, "tokenizer.json")
+        )
+        self.tokenizer.enable_truncation(max_length=_MAX_TOKENS)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            hf_hub_download(model_id, "onnx/model.onnx"),
+            options,
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = {item.name for item in self.session.get_inputs()}
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts in one forward pass; returns a (len(texts), dim) float32 array"""
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([encoding.ids for encoding in encodings], dtype=np.int64)
+        attention_mask = np.array(
+            [encoding.attention_mask for encoding in encodings], dtype=np.int64
+        )
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            inputs["token_type_ids"] = np.zeros_like(input_ids)
+
+        token_embeddings = self.session.run(None, inputs)[0]  # (batch, tokens, dim)
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.maximum(
+            mask.sum(axis=1), 1e-9
+        )
+        pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+        return pooled.astype(np.float32)
+
+
+_embedder: Optional[LocalEmbedder] = None
+_embedder_failed = False
+_embedder_lock = threading.Lock()
+
+
+def get_local_embedder() -> Optional[LocalEmbedder]:
+    """
+    Get the process-wide local embedder, loading the model on first use.
+
+    Returns:
+        The embedder, or None if the optional dependencies or model can't be loaded
+        (the failure is remembered so all later calls consistently use OpenAI)
+    """
+    global _embedder, _embedder_failed
+    if _embedder is not None or _embedder_failed:
+        return _embedder
+
+    with _embedder_lock:
+        if _embedder is None and not _embedder_failed:
+            try:
+                _embedder = LocalEmbedder()
+            except Exception as e:
+                print(f"Local embedding model unavailable, using OpenAI: {e}")
+                _embedder_failed = True
+    return _embedder
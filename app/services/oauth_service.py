@@ -1,7 +1,13 @@
 from typing import Optional, Dict, Any, Tuple
 from authlib.integrations.requests_client import OAuth2Session
+from requests.adapters import HTTPAdapter
 from app.core.config import settings
+import threading
 import httpx
+import orjson
+
+# Shared HTTP client so userinfo lookups reuse pooled connections
+_http_client = httpx.Client(timeout=10.0)
 
 
 class GoogleOAuthService:
@@ -15,6 +21,24 @@ class GoogleOAuthService:
         self.token_url = "https://oauth2.googleapis.com/token"
         self.userinfo_url = "https://www.googleapis.com/oauth2/v2/userinfo"
         self.scope = "openid email profile"
+        # OAuth2Session keeps per-request state, so each thread gets its own
+        # session; connections within a thread are pooled and reused
+        self._local = threading.local()
+
+    def _get_session(self) -> OAuth2Session:
+        """Get this thread's OAuth2Session, creating it on first use"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = OAuth2Session(
+                client_id=self.client_id,
+                client_secret=self.client_secret,
+                redirect_uri=self.redirect_uri,
+                scope=self.scope,
+            )
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
 
     def get_authorization_url(self, state: Optional[str] = None) -> Tuple[str, str]:
         """
@@ -26,12 +50,7 @@ class GoogleOAuthService:
         Returns:
             Tuple of (authorization_url, state)
         """
-        oauth_client = OAuth2Session(
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            redirect_uri=self.redirect_uri,
-            scope=self.scope,
-        )
+        oauth_client = self._get_session()
 
         authorization_url, state = oauth_client.create_authorization_url(
             self.authorization_base_url, state=state
@@ -49,15 +68,14 @@ class GoogleOAuthService:
         Returns:
             Dictionary containing token information
         """
-        oauth_client = OAuth2Session(
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            redirect_uri=self.redirect_uri,
-        )
+        oauth_client = self._get_session()
 
-        token = oauth_client.fetch_token(url=self.token_url, code=code)
-
-        return token
+        try:
+            return oauth_client.fetch_token(url=self.token_url, code=code)
+        finally:
+            # The session is reused for other users on this thread, so don't
+            # let it keep this user's tokens
+            oauth_client.token = None
 
     def get_user_info(self, access_token: str) -> Dict[str, Any]:
         """
@@ -69,12 +87,11 @@ class GoogleOAuthService:
         Returns:
             Dictionary containing user information (id, email, name, picture, etc.)
         """
-        with httpx.Client() as client:
-            response = client.get(
-                self.userinfo_url, headers={"Authorization": f"Bearer {access_token}"}
-            )
-            response.raise_for_status()
-            return response.json()
+        response = _http_client.get(
+            self.userinfo_url, headers={"Authorization": f"Bearer {access_token}"}
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     def authenticate_user(self, code: str) -> Dict[str, Any]:
         """
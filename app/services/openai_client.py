@@ -0,0 +1,38 @@
+"""
+Shared OpenAI clients with tuned HTTP connection pools.
+
+All services reuse these clients so keep-alive connections (and, for the
+async client, HTTP/2 multiplexing) are shared across requests instead of
+each service instance paying its own TLS handshakes.
+"""
+
+import httpx
+import openai
+from app.core.config import settings
+
+# Idle connections are kept for two minutes so the pool warmed at startup survives
+_LIMITS = httpx.Limits(
+    max_connections=200, max_keepalive_connections=100, keepalive_expiry=120.0
+)
+# Short read timeout for the small analyzer requests, so a stuck call fails fast
+_TIMEOUT = httpx.Timeout(30.0, connect=2.0)
+# Transcriptions and long completions can legitimately take minutes
+_LONG_TIMEOUT = httpx.Timeout(600.0, connect=2.0)
+
+# OpenAI SDK retries 408/409/429/5xx and connection errors with exponential backoff
+_MAX_RETRIES = 3
+
+shared_client = openai.AsyncOpenAI(
+    api_key=settings.openai_api_key,
+    max_retries=_MAX_RETRIES,
+    http_client=httpx.AsyncClient(http2=True, limits=_LIMITS, timeout=_TIMEOUT),
+)
+
+shared_sync_client = openai.OpenAI(
+    api_key=settings.openai_api_key,
+    max_retries=_MAX_RETRIES,
+    http_client=httpx.Client(http2=True, limits=_LIMITS, timeout=_TIMEOUT),
+)
+
+# Same connection pool as shared_sync_client, for slow requests
+long_running_sync_client = shared_sync_client.with_options(timeout=_LONG_TIMEOUT)
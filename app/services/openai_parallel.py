@@ -0,0 +1,263 @@
+"""
+Rate-limited parallel processing of OpenAI requests.
+
+Modelled on the openai-cookbook api_request_parallel_processor: items are put
+on an asyncio.Queue and consumed by a fixed number of worker coroutines. Before
+each call a worker takes capacity from request and token buckets that refill
+continuously up to the per-minute limits, so bulk jobs run at the account's
+real throughput without tripping 429 backoff storms. The buckets are shared by
+every run in the process, so concurrent requests draw on the same limits.
+
+A request that still gets rate limited pauses all workers for the Retry-After
+interval and is requeued. Connection errors, timeouts and 408/409/5xx responses
+are retried with exponential backoff; any other error fails the item at once.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, TypeVar
+
+import openai
+
+from app.core.config import settings
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Cool-down after a rate limit error when the response has no Retry-After header
+_DEFAULT_RETRY_AFTER_SECONDS = 15.0
+
+# Exponential backoff between attempts after transient errors, as in the OpenAI SDK
+_INITIAL_BACKOFF_SECONDS = 0.5
+_MAX_BACKOFF_SECONDS = 8.0
+
+# Rough token count of a chat request: ~4 characters per token
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(request: dict) -> int:
+    """Estimate prompt plus completion tokens of a chat completion request"""
+    prompt_chars = sum(len(message["content"]) for message in request["messages"])
+    return prompt_chars // _CHARS_PER_TOKEN + request.get("max_tokens", 0)
+
+
+@dataclass
+class StatusTracker:
+    """Counters describing the progress of a parallel run."""
+
+    num_tasks_started: int = 0
+    num_tasks_in_progress: int = 0
+    num_tasks_succeeded: int = 0
+    num_tasks_failed: int = 0
+    num_rate_limit_errors: int = 0
+    num_other_errors: int = 0
+
+
+@dataclass
+class APIRequest:
+    """A single queued item with its token estimate and remaining attempts."""
+
+    index: int
+    item: Any
+    token_estimate: int
+    attempts_left: int
+
+
+class RateLimiter:
+    """Request and token buckets refilling continuously up to per-minute limits"""
+
+    def __init__(self, max_requests_per_minute: int, max_tokens_per_minute: int):
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self._available_requests = float(max_requests_per_minute)
+        self._available_tokens = float(max_tokens_per_minute)
+        self._last_update = time.monotonic()
+        self._paused_until = 0.0
+        # Held only for non-blocking bookkeeping, never across an await
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out capacity for the given number of seconds"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until one request and the given number of tokens are available"""
+        # A single request larger than the whole bucket would otherwise wait forever
+        tokens = min(tokens, self.max_tokens_per_minute)
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait is None:
+                return
+            await asyncio.sleep(wait)
+
+    def _try_acquire(self, tokens: int) -> Optional[float]:
+        """Take capacity if available, else return roughly how long to wait"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+
+            elapsed = now - self._last_update
+            self._available_requests = min(
+                self._available_requests
+                + elapsed * self.max_requests_per_minute / 60.0,
+                self.max_requests_per_minute,
+            )
+            self._available_tokens = min(
+                self._available_tokens + elapsed * self.max_tokens_per_minute / 60.0,
+                self.max_tokens_per_minute,
+            )
+            self._last_update = now
+            if self._available_requests >= 1 and self._available_tokens >= tokens:
+                self._available_requests -= 1
+                self._available_tokens -= tokens
+                return None
+            # Roughly until enough capacity has refilled
+            return max(
+                (1 - self._available_requests) * 60.0 / self.max_requests_per_minute,
+                (tokens - self._available_tokens) * 60.0 / self.max_tokens_per_minute,
+                0.001,
+            )
+
+
+# Process-wide limiter shared by all runs using the configured account limits
+shared_rate_limiter = RateLimiter(
+    settings.openai_max_requests_per_minute, settings.openai_max_tokens_per_minute
+)
+
+
+class ParallelRequestProcessor:
+    """Runs an async call over many items within request and token rate limits"""
+
+    def __init__(
+        self,
+        max_requests_per_minute: Optional[int] = None,
+        max_tokens_per_minute: Optional[int] = None,
+        max_workers: int = 10,
+        max_attempts: int = 3,
+    ):
+        if max_requests_per_minute or max_tokens_per_minute:
+            self.rate_limiter = RateLimiter(
+                max_requests_per_minute or settings.openai_max_requests_per_minute,
+                max_tokens_per_minute or settings.openai_max_tokens_per_minute,
+            )
+        else:
+            self.rate_limiter = shared_rate_limiter
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+
+    async def run(
+        self,
+        items: List[T],
+        call: Callable[[T], Awaitable[R]],
+        token_estimate: Callable[[T], int],
+        default: R,
+    ) -> List[R]:
+        """
+        Apply `call` to every item and return the results in input order.
+
+        Args:
+            items: Inputs to process
+            call: Coroutine function making one OpenAI request; must raise on failure
+            token_estimate: Estimated tokens one item's request will consume
+            default: Result used for items that fail after all attempts
+
+        Returns:
+            One result per item
+        """
+        if not items:
+            return []
+
+        results: List[R] = [default] * len(items)
+        status = StatusTracker()
+        queue: asyncio.Queue = asyncio.Queue()
+        for index, item in enumerate(items):
+            queue.put_nowait(
+                APIRequest(index, item, token_estimate(item), self.max_attempts)
+            )
+
+        async def worker() -> None:
+            while True:
+                try:
+                    request = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                await self.rate_limiter.acquire(request.token_estimate)
+                status.num_tasks_started += 1
+                status.num_tasks_in_progress += 1
+                request.attempts_left -= 1
+                try:
+                    results[request.index] = await call(request.item)
+                    status.num_tasks_succeeded += 1
+                except openai.RateLimitError as e:
+                    status.num_rate_limit_errors += 1
+                    self.rate_limiter.pause(_retry_after_seconds(e))
+                    self._retry_or_fail(queue, request, status, e)
+                except Exception as e:
+                    status.num_other_errors += 1
+                    if not _is_retryable(e):
+                        # Other 4xx and parse errors would fail the same way again
+                        request.attempts_left = 0
+                    elif request.attempts_left > 0:
+                        await asyncio.sleep(self._backoff_seconds(request))
+                    self._retry_or_fail(queue, request, status, e)
+                finally:
+                    status.num_tasks_in_progress -= 1
+
+        # Failed requests are requeued, so keep workers running until the queue drains
+        while not queue.empty():
+            await asyncio.gather(
+                *(worker() for _ in range(min(self.max_workers, queue.qsize())))
+            )
+
+        if status.num_tasks_failed:
+            print(
+                f"Parallel OpenAI run: {status.num_tasks_succeeded} succeeded, "
+                f"{status.num_tasks_failed} failed, "
+                f"{status.num_rate_limit_errors} rate limit errors"
+            )
+        return results
+
+    def _retry_or_fail(
+        self,
+        queue: asyncio.Queue,
+        request: APIRequest,
+        status: StatusTracker,
+        error: Exception,
+    ) -> None:
+        """Requeue a failed request, or record it as failed when out of attempts"""
+        if request.attempts_left > 0:
+            queue.put_nowait(request)
+        else:
+            status.num_tasks_failed += 1
+            print(f"OpenAI request {request.index} failed after retries: {error}")
+
+    def _backoff_seconds(self, request: APIRequest) -> float:
+        """Jittered exponential delay before the request's next attempt"""
+        attempts_made = self.max_attempts - request.attempts_left
+        delay = min(
+            _INITIAL_BACKOFF_SECONDS * 2 ** (attempts_made - 1), _MAX_BACKOFF_SECONDS
+        )
+        return delay * (1 - 0.25 * random.random())
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether an error is transient: connection problems, timeouts, 408/409/5xx"""
+    if isinstance(error, openai.APIConnectionError):  # Includes APITimeoutError
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in (408, 409) or error.status_code >= 500
+    return False
+
+
+def _retry_after_seconds(error: openai.RateLimitError) -> float:
+    """Read the Retry-After header of a rate limit error, with a fixed fallback"""
+    try:
+        return float(error.response.headers["retry-after"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return _DEFAULT_RETRY_AFTER_SECONDS
@@ -2,107 +2,155 @@
 Plan service for managing subscription plans and feature access.
 """
 
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from enum import StrEnum
+from types import MappingProxyType
+from typing import Mapping, Optional
 from datetime import datetime
 from app.models.user import User
 
 
-# Plan configuration with features and pricing
-PLAN_CONFIG: Dict[str, Dict[str, Any]] = {
-    "free": {
-        "name": "Free",
-        "price_monthly": 0,
-        "price_yearly": 0,
-        "duration_days": None,
-        "features": {
-            "ai_questions_per_day": 5,
-            "has_themes": False,
-            "has_weekly_insights": False,
-            "has_monthly_insights": False,
-            "has_voice_recording": False,
-            "has_visual_themes": False,
-            "has_visual_effects": False,
-        },
-    },
-    "trial": {
-        "name": "Trial",
-        "price_monthly": 0,
-        "price_yearly": 0,
-        "duration_days": 14,  # 14-day trial
-        "features": {
-            "ai_questions_per_day": None,  # Unlimited
-            "has_themes": True,
-            "has_weekly_insights": True,
-            "has_monthly_insights": True,
-            "has_voice_recording": True,
-            "has_visual_themes": True,
-            "has_visual_effects": True,
-        },
-    },
-    "pro_month": {
-        "name": "Pro Monthly",
-        "price_monthly": 1990,
-        "price_yearly": 0,
-        "duration_days": 30,
-        "features": {
-            "ai_questions_per_day": None,  # Unlimited
-            "has_themes": True,
-            "has_weekly_insights": True,
-            "has_monthly_insights": True,
-            "has_voice_recording": True,
-            "has_visual_themes": True,
-            "has_visual_effects": True,
-        },
-    },
-    "pro_year": {
-        "name": "Pro Yearly",
-        "price_monthly": 0,
-        "price_yearly": 19100,
-        "duration_days": 365,
-        "features": {
-            "ai_questions_per_day": None,  # Unlimited
-            "has_themes": True,
-            "has_weekly_insights": True,
-            "has_monthly_insights": True,
-            "has_voice_recording": True,
-            "has_visual_themes": True,
-            "has_visual_effects": True,
-        },
-    },
-}
-
-
-def get_plan_config(plan: str) -> Dict[str, Any]:
+@dataclass(frozen=True, slots=True)
+class PlanFeatures:
+    """Feature flags and limits included in a plan."""
+
+    ai_questions_per_day: Optional[int]  # None means unlimited
+    has_themes: bool
+    has_weekly_insights: bool
+    has_monthly_insights: bool
+    has_voice_recording: bool
+    has_visual_themes: bool
+    has_visual_effects: bool
+
+
+@dataclass(frozen=True, slots=True)
+class Plan:
+    """Subscription plan pricing, duration and features."""
+
+    name: str
+    price_monthly: int
+    price_yearly: int
+    duration_days: Optional[int]
+    features: PlanFeatures
+
+
+class Feature(StrEnum):
+    """Names of boolean plan features, for use with can_use_feature."""
+
+    THEMES = "has_themes"
+    WEEKLY_INSIGHTS = "has_weekly_insights"
+    MONTHLY_INSIGHTS = "has_monthly_insights"
+    VOICE_RECORDING = "has_voice_recording"
+    VISUAL_THEMES = "has_visual_themes"
+    VISUAL_EFFECTS = "has_visual_effects"
+
+
+# Boolean feature names; limits like ai_questions_per_day are not features
+_FEATURES = frozenset(Feature)
+
+
+FREE_FEATURES = PlanFeatures(
+    ai_questions_per_day=5,
+    has_themes=False,
+    has_weekly_insights=False,
+    has_monthly_insights=False,
+    has_voice_recording=False,
+    has_visual_themes=False,
+    has_visual_effects=False,
+)
+
+PRO_FEATURES = PlanFeatures(
+    ai_questions_per_day=None,  # Unlimited
+    has_themes=True,
+    has_weekly_insights=True,
+    has_monthly_insights=True,
+    has_voice_recording=True,
+    has_visual_themes=True,
+    has_visual_effects=True,
+)
+
+
+# Plan configuration with features and pricing (read-only)
+PLAN_CONFIG: Mapping[str, Plan] = MappingProxyType(
+    {
+        "free": Plan(
+            name="Free",
+            price_monthly=0,
+            price_yearly=0,
+            duration_days=None,
+            features=FREE_FEATURES,
+        ),
+        "trial": Plan(
+            name="Trial",
+            price_monthly=0,
+            price_yearly=0,
+            duration_days=14,  # 14-day trial
+            features=PRO_FEATURES,
+        ),
+        "pro_month": Plan(
+            name="Pro Monthly",
+            price_monthly=1990,
+            price_yearly=0,
+            duration_days=30,
+            features=PRO_FEATURES,
+        ),
+        "pro_year": Plan(
+            name="Pro Yearly",
+            price_monthly=0,
+            price_yearly=19100,
+            duration_days=365,
+            features=PRO_FEATURES,
+        ),
+    }
+)
+
+# Price charged for each plan: monthly plans bill monthly, yearly plans yearly
+_PRICE_TABLE: Mapping[str, float] = MappingProxyType(
+    {
+        plan_id: float(plan.price_monthly or plan.price_yearly)
+        for plan_id, plan in PLAN_CONFIG.items()
+    }
+)
+
+
+def get_plan_config(plan: str) -> Plan:
     """Get configuration for a specific plan."""
     return PLAN_CONFIG.get(plan, PLAN_CONFIG["free"])
 
 
-def can_use_feature(user: User, feature: str) -> bool:
+def can_use_feature(
+    user: User, feature: Feature | str, *, now: Optional[datetime] = None
+) -> bool:
     """
     Check if user can use a specific feature based on their plan.
 
     Args:
         user: User instance
-        feature: Feature name (e.g., "has_themes", "has_voice_recording")
+        feature: Feature name or Feature member (e.g., Feature.THEMES, "has_themes")
+        now: Current UTC time, shared across checks within one request
 
     Returns:
         True if user can use the feature, False otherwise
     """
-    if not is_plan_active(user):
+    if feature not in _FEATURES:
+        return False
+
+    if not is_plan_active(user, now=now):
         # If plan is expired, check free plan features
         plan_config = PLAN_CONFIG["free"]
     else:
         plan_config = get_plan_config(user.plan)
 
-    return plan_config["features"].get(feature, False)
+    return getattr(plan_config.features, feature, False)
 
 
-def is_plan_active(user: User) -> bool:
+def is_plan_active(user: User, *, now: Optional[datetime] = None) -> bool:
     """
     Check if user's current plan is active.
 
     Args:
         user: User instance
+        now: Current UTC time (defaults to datetime.utcnow())
 
     Returns:
         True if plan is active, False otherwise
@@ -113,33 +161,41 @@ def is_plan_active(user: User) -> bool:
     if user.plan_expires_at is None:
         return False
 
-    return datetime.utcnow() < user.plan_expires_at
+    if now is None:
+        now = datetime.utcnow()
+    return now < user.plan_expires_at
 
 
-def get_ai_questions_limit(user: User) -> Optional[int]:
+def get_ai_questions_limit(
+    user: User, *, now: Optional[datetime] = None
+) -> Optional[int]:
     """
     Get the daily limit for AI questions for a user.
 
     Args:
         user: User instance
+        now: Current UTC time, shared across checks within one request
 
     Returns:
         Daily limit (None means unlimited) or None if plan is expired
     """
-    if not is_plan_active(user):
+    if not is_plan_active(user, now=now):
         plan_config = PLAN_CONFIG["free"]
     else:
         plan_config = get_plan_config(user.plan)
 
-    return plan_config["features"].get("ai_questions_per_day")
+    return plan_config.features.ai_questions_per_day
 
 
-def can_skip_ai_questions(user: User) -> tuple[bool, str | None, int, int]:
+def can_skip_ai_questions(
+    user: User, *, now: Optional[datetime] = None
+) -> tuple[bool, str | None, int, int]:
     """
     Check if user can skip AI questions (generate new ones).
 
     Args:
         user: User instance
+        now: Current UTC time, shared across checks within one request
 
     Returns:
         Tuple of (can_skip: bool, error_message: str | None, remaining_skips: int, max_skips: int)
@@ -148,8 +204,11 @@ def can_skip_ai_questions(user: User) -> tuple[bool, str | None, int, int]:
     """
     from datetime import timedelta
 
+    if now is None:
+        now = datetime.utcnow()
+
     # Pro users: 5 skips per hour
-    if user.plan in ["pro_month", "pro_year"] and is_plan_active(user):
+    if user.plan in ["pro_month", "pro_year"] and is_plan_active(user, now=now):
         MAX_SKIPS = 5
         COOLDOWN_HOURS = 1
 
@@ -158,10 +217,10 @@ def can_skip_ai_questions(user: User) -> tuple[bool, str | None, int, int]:
             cooldown_end = user.ai_questions_skips_reset_at + timedelta(
                 hours=COOLDOWN_HOURS
             )
-            if datetime.utcnow() < cooldown_end:
+            if now < cooldown_end:
                 # Still in cooldown, check if user has used all skips
                 if user.ai_questions_skips_count >= MAX_SKIPS:
-                    time_remaining = cooldown_end - datetime.utcnow()
+                    time_remaining = cooldown_end - now
                     minutes = int(time_remaining.total_seconds() / 60)
                     return False, f"Сброс доступен через {minutes}м", 0, MAX_SKIPS
                 else:
@@ -184,10 +243,10 @@ def can_skip_ai_questions(user: User) -> tuple[bool, str | None, int, int]:
             cooldown_end = user.ai_questions_skips_reset_at + timedelta(
                 days=COOLDOWN_DAYS
             )
-            if datetime.utcnow() < cooldown_end:
+            if now < cooldown_end:
                 # Still in cooldown
                 if user.ai_questions_skips_count >= MAX_SKIPS:
-                    time_remaining = cooldown_end - datetime.utcnow()
+                    time_remaining = cooldown_end - now
                     hours = int(time_remaining.total_seconds() / 3600)
                     minutes = int((time_remaining.total_seconds() % 3600) / 60)
                     return (
@@ -215,9 +274,9 @@ def can_skip_ai_questions(user: User) -> tuple[bool, str | None, int, int]:
             cooldown_end = user.ai_questions_skips_reset_at + timedelta(
                 days=COOLDOWN_DAYS
             )
-            if datetime.utcnow() < cooldown_end:
+            if now < cooldown_end:
                 if user.ai_questions_skips_count >= MAX_SKIPS:
-                    time_remaining = cooldown_end - datetime.utcnow()
+                    time_remaining = cooldown_end - now
                     hours = int(time_remaining.total_seconds() / 3600)
                     minutes = int((time_remaining.total_seconds() % 3600) / 60)
                     return (
@@ -247,9 +306,4 @@ def get_plan_price(plan: str) -> float:
     Returns:
         Price in KZT
     """
-    plan_config = get_plan_config(plan)
-    if plan == "pro_month":
-        return plan_config["price_monthly"]
-    elif plan == "pro_year":
-        return plan_config["price_yearly"]
-    return 0.0
+    return _PRICE_TABLE.get(plan, 0.0)
@@ -1,13 +1,78 @@
-import openai
+import io
+import re
 from typing import List
-from app.core.config import settings
+from app.services.openai_client import shared_sync_client
+
+# Each entry is cut to this many characters, and the joined entries are capped
+# at the budget so long histories don't inflate the prompt
+_ENTRY_CHAR_LIMIT = 500
+_ENTRIES_CHAR_BUDGET = 4000
+_ENTRY_SEPARATOR = "\n\n---\n\n"
+
+# One question per line: leading numbering/bullets and surrounding quotes are dropped,
+# and a line is kept if it ends with "?" or is longer than 10 characters. The prefix
+# is possessive so it can't hand digits or spaces back to the capture.
+_QUESTION_RE = re.compile(
+    r"^[ \t0-9.\-•)]*+[\"']?(\S.*?[?？]|\S.{10,}?)[\"']?[ \t]*$", re.M
+)
+
+# Static parts of the prompt are built once at import time and kept byte-identical
+# across calls, so OpenAI's automatic prompt caching can reuse the shared prefix.
+_SYSTEM_PROMPT = (
+    "You are a supportive, empathetic therapist who has carefully read the user's journal entries. "
+    "Your questions must demonstrate that you have truly read and understood their entries. "
+    "Reference specific details, events, people, places, emotions, or situations mentioned in their writing. "
+    "Questions should be warm, non-judgmental, and show genuine engagement with their content. "
+    "Always respond in Russian. Keep questions concise (one sentence, max 20 words). "
+    "Make each question feel like you're continuing a conversation about something specific they wrote. "
+    "Avoid generic questions - if they mentioned work stress, ask about that specific situation. "
+    "If they wrote about a person, reference that person. If they mentioned a feeling, explore that feeling deeper. "
+    "Each question should reference different specific details from their entries to show you've read everything carefully."
+)
+
+_PROMPT_PREFIX = (
+    "Внимательно прочитай следующие записи пользователя. Твоя задача - создать конкретные вопросы, "
+    "которые показывают, что ты действительно прочитал и понял содержание записей.\n\n"
+    "КРИТИЧЕСКИ ВАЖНО: Каждый вопрос ДОЛЖЕН ссылаться на конкретные детали из записей:\n"
+    "- Упоминай конкретные события, ситуации, людей, места, которые были описаны\n"
+    "- Ссылайся на конкретные эмоции, переживания, мысли, которые были выражены\n"
+    "- Используй конкретные темы, проблемы, радости, которые были затронуты\n"
+    "- Покажи, что ты заметил важные детали и хочешь узнать больше именно об этом\n\n"
+    "Примеры ПРАВИЛЬНЫХ вопросов (если в записи упоминалась работа):\n"
+    "✓ 'Как сейчас обстоят дела с тем проектом, о котором вы писали?'\n"
+    "✓ 'Что изменилось в отношениях с коллегой, которого вы упоминали?'\n\n"
+    "Примеры НЕПРАВИЛЬНЫХ (слишком общих) вопросов:\n"
+    "✗ 'Как дела на работе?'\n"
+    "✗ 'Что вас волнует?'\n\n"
+    "Каждый вопрос должен быть:\n"
+    "- Конкретным (ссылаться на детали из записей)\n"
+    "- Поддерживающим и эмпатичным\n"
+    "- Открытым (не требующим ответа да/нет)\n"
+    "- Кратким (одно предложение, максимум 20 слов)\n"
+    "- Уникальным (каждый вопрос о разных конкретных деталях из записей)\n\n"
+    "Последние записи пользователя:\n"
+)
+
+_PROMPT_SUFFIX = (
+    "\n\n"
+    "Создай {n} конкретных вопроса, которые показывают, что ты внимательно прочитал записи. "
+    "Каждый вопрос должен ссылаться на конкретные детали из текста выше. "
+    "Верни только вопросы, каждый на отдельной строке, без нумерации и дополнительного текста:"
+)
+
+# Used when there are no entries, and to top up a short or failed response
+_DEFAULT_QUESTIONS = (
+    "О чем вы думали в последнее время?",
+    "Что вас сейчас волнует?",
+    "Как вы себя чувствуете сегодня?",
+)
 
 
 class QuestionGeneratorService:
     """Service to generate therapist-like questions based on recent entries"""
 
     def __init__(self):
-        self.client = openai.OpenAI(api_key=settings.openai_api_key)
+        self.client = shared_sync_client
         self.model = "gpt-4o-mini"  # Use mini for cost efficiency
 
     def generate_questions(
@@ -27,111 +92,73 @@ class QuestionGeneratorService:
         try:
             if not recent_entries:
                 # Default questions if no entries
-                return [
-                    "О чем вы думали в последнее время?",
-                    "Что вас сейчас волнует?",
-                    "Как вы себя чувствуете сегодня?",
-                ]
+                return list(_DEFAULT_QUESTIONS)
 
             # Limit to last N entries
             entries_to_analyze = recent_entries[:max_entries]
 
             prompt = self._create_questions_prompt(entries_to_analyze, num_questions)
 
-            response = self.client.chat.completions.create(
+            stream = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are a supportive, empathetic therapist who has carefully read the user's journal entries. "
-                            "Your questions must demonstrate that you have truly read and understood their entries. "
-                            "Reference specific details, events, people, places, emotions, or situations mentioned in their writing. "
-                            "Questions should be warm, non-judgmental, and show genuine engagement with their content. "
-                            "Always respond in Russian. Keep questions concise (one sentence, max 20 words). "
-                            "Make each question feel like you're continuing a conversation about something specific they wrote. "
-                            "Avoid generic questions - if they mentioned work stress, ask about that specific situation. "
-                            "If they wrote about a person, reference that person. If they mentioned a feeling, explore that feeling deeper. "
-                            "Each question should reference different specific details from their entries to show you've read everything carefully."
-                        ),
-                    },
+                    {"role": "system", "content": _SYSTEM_PROMPT},
                     {"role": "user", "content": prompt},
                 ],
                 temperature=0.9,  # Slightly creative but still focused
                 max_tokens=250,  # Increased for more detailed questions
+                stream=True,
             )
 
-            questions_text = response.choices[0].message.content.strip()
-            print(f"Raw AI response: {questions_text}")
-
-            # Parse questions - they might be separated by newlines, numbers, or bullets
+            # Parse questions line by line as they stream in, and stop generation
+            # as soon as we have enough of them
             questions = []
-            for line in questions_text.split("\n"):
-                line = line.strip()
-                if not line:
-                    continue
-                # Remove numbering (1., 2., etc.) or bullets (-, •, etc.)
-                line = line.lstrip("0123456789.-•) ")
-                # Remove quotes if present
-                line = line.strip('"').strip("'").strip()
-                # Check if line ends with ? or is a valid question
-                if line and (line.endswith("?") or len(line) > 10):
-                    questions.append(line)
+            buf = ""
+            try:
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    buf += chunk.choices[0].delta.content or ""
+                    while "\n" in buf and len(questions) < num_questions:
+                        line, buf = buf.split("\n", 1)
+                        self._parse_question_line(line, questions)
+                    if len(questions) >= num_questions:
+                        break
+                else:
+                    # Last line has no trailing newline
+                    self._parse_question_line(buf, questions)
+            finally:
+                stream.close()
 
             print(f"Parsed {len(questions)} questions from AI response: {questions}")
 
             # If we didn't get enough questions, add defaults
             if len(questions) < num_questions:
-                default_questions = [
-                    "О чем вы думали в последнее время?",
-                    "Что вас сейчас волнует?",
-                    "Как вы себя чувствуете сегодня?",
-                ]
-                questions.extend(default_questions[: num_questions - len(questions)])
+                questions.extend(_DEFAULT_QUESTIONS[: num_questions - len(questions)])
 
             return questions[:num_questions]  # Return only requested number
 
         except Exception as e:
             print(f"Error generating questions: {e}")
             # Fallback to default questions
-            return [
-                "О чем вы думали в последнее время?",
-                "Что вас сейчас волнует?",
-                "Как вы себя чувствуете сегодня?",
-            ]
+            return list(_DEFAULT_QUESTIONS)
+
+    def _parse_question_line(self, line: str, questions: List[str]) -> None:
+        """Append the question found in a single response line, if any"""
+        match = _QUESTION_RE.match(line)
+        if match:
+            questions.append(match.group(1).strip())
 
     def _create_questions_prompt(self, entries: List[str], num_questions: int) -> str:
         """Create a prompt for generating multiple contextual questions"""
-        entries_text = "\n\n---\n\n".join(
-            [
-                # Limit each entry to 500 chars
-                f"Запись {i+1}:\n{entry[:500]}"
-                for i, entry in enumerate(entries)
-            ]
-        )
-
-        return (
-            f"Внимательно прочитай следующие записи пользователя. Твоя задача - создать {num_questions} конкретных вопроса, "
-            f"которые показывают, что ты действительно прочитал и понял содержание записей.\n\n"
-            f"КРИТИЧЕСКИ ВАЖНО: Каждый вопрос ДОЛЖЕН ссылаться на конкретные детали из записей:\n"
-            f"- Упоминай конкретные события, ситуации, людей, места, которые были описаны\n"
-            f"- Ссылайся на конкретные эмоции, переживания, мысли, которые были выражены\n"
-            f"- Используй конкретные темы, проблемы, радости, которые были затронуты\n"
-            f"- Покажи, что ты заметил важные детали и хочешь узнать больше именно об этом\n\n"
-            f"Примеры ПРАВИЛЬНЫХ вопросов (если в записи упоминалась работа):\n"
-            f"✓ 'Как сейчас обстоят дела с тем проектом, о котором вы писали?'\n"
-            f"✓ 'Что изменилось в отношениях с коллегой, которого вы упоминали?'\n\n"
-            f"Примеры НЕПРАВИЛЬНЫХ (слишком общих) вопросов:\n"
-            f"✗ 'Как дела на работе?'\n"
-            f"✗ 'Что вас волнует?'\n\n"
-            f"Каждый вопрос должен быть:\n"
-            f"- Конкретным (ссылаться на детали из записей)\n"
-            f"- Поддерживающим и эмпатичным\n"
-            f"- Открытым (не требующим ответа да/нет)\n"
-            f"- Кратким (одно предложение, максимум 20 слов)\n"
-            f"- Уникальным (каждый вопрос о разных конкретных деталях из записей)\n\n"
-            f"Последние записи пользователя:\n{entries_text}\n\n"
-            f"Создай {num_questions} конкретных вопроса, которые показывают, что ты внимательно прочитал записи. "
-            f"Каждый вопрос должен ссылаться на конкретные детали из текста выше. "
-            f"Верни только вопросы, каждый на отдельной строке, без нумерации и дополнительного текста:"
-        )
+        buf = io.StringIO()
+        for i, entry in enumerate(entries):
+            chunk = f"Запись {i+1}:\n{entry[:_ENTRY_CHAR_LIMIT]}"
+            if i > 0:
+                chunk = _ENTRY_SEPARATOR + chunk
+            if i > 0 and buf.tell() + len(chunk) > _ENTRIES_CHAR_BUDGET:
+                break
+            buf.write(chunk)
+        entries_text = buf.getvalue()
+
+        return _PROMPT_PREFIX + entries_text + _PROMPT_SUFFIX.format(n=num_questions)
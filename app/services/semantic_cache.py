@@ -0,0 +1,310 @@
+"""
+Semantic cache for LLM results over entry embeddings.
+
+Near-duplicate diary entries ("tired from work again", "exhausted after work")
+get nearly identical results, so a cached result is reused when a new entry's
+embedding is close enough to one seen before.
+"""
+
+import asyncio
+import base64
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+import numpy as np
+from cachetools import LRUCache
+from app.core.config import settings
+from app.services.local_embeddings import LocalEmbedder, get_local_embedder
+
+try:
+    # Optional SIMD kernels; numpy matmul is used when not installed
+    import simsimd
+except ImportError:
+    simsimd = None
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+# Texts sent per embeddings request when prefetching a batch (API limit is 2048)
+EMBEDDING_BATCH_SIZE = 256
+
+# Embeddings of recently seen texts, shared by sentiment and entry analysis
+_embedding_cache: LRUCache = LRUCache(maxsize=2048)
+_embedding_cache_lock = threading.Lock()
+_embedding_cache_hits = 0
+_embedding_cache_misses = 0
+
+
+def _normalize(encoded: str) -> np.ndarray:
+    """Decode a base64 embedding into a unit-length float32 vector."""
+    # Base64 float32 bytes map straight onto an array, with no per-float objects
+    embedding = np.frombuffer(base64.b64decode(encoded), dtype=np.float32)
+    norm = float(np.sqrt(np.vdot(embedding, embedding)))
+    return embedding / norm if norm else embedding
+
+
+def _text_key(text: str) -> bytes:
+    return hashlib.sha256(text.encode()).digest()
+
+
+def _cached_embedding(key: bytes) -> Optional[np.ndarray]:
+    """Look up an embedding in the shared cache, counting hits and misses."""
+    global _embedding_cache_hits, _embedding_cache_misses
+    with _embedding_cache_lock:
+        cached = _embedding_cache.get(key)
+        if cached is None:
+            _embedding_cache_misses += 1
+        else:
+            _embedding_cache_hits += 1
+    return cached
+
+
+def embedding_cache_stats() -> dict:
+    """Hit/miss counters and current size of the shared embedding cache."""
+    with _embedding_cache_lock:
+        return {
+            "hits": _embedding_cache_hits,
+            "misses": _embedding_cache_misses,
+            "size": len(_embedding_cache),
+            "maxsize": _embedding_cache.maxsize,
+        }
+
+
+def _local_embedder() -> Optional[LocalEmbedder]:
+    """The local ONNX embedder when enabled and loadable, else None."""
+    if not settings.use_local_embeddings:
+        return None
+    return get_local_embedder()
+
+
+def _embed_locally(embedder: LocalEmbedder, texts: List[str]) -> Optional[np.ndarray]:
+    try:
+        return embedder.embed(texts)
+    except Exception as e:
+        # No OpenAI fallback: its vectors would not be comparable to cached ones
+        print(f"Error computing local embeddings for semantic cache: {e}")
+        return None
+
+
+def _store_embeddings(texts: List[str], embeddings: Iterable[np.ndarray]) -> None:
+    with _embedding_cache_lock:
+        for text, embedding in zip(texts, embeddings):
+            _embedding_cache[_text_key(text)] = embedding
+
+
+def get_embedding(client, text: str) -> Optional[np.ndarray]:
+    """
+    Get the normalized embedding of a text using a sync OpenAI client.
+
+    Returns:
+        Unit-length float32 vector, or None if the embedding request fails
+    """
+    key = _text_key(text)
+    cached = _cached_embedding(key)
+    if cached is not None:
+        return cached
+
+    embedder = _local_embedder()
+    if embedder is not None:
+        vectors = _embed_locally(embedder, [text])
+        if vectors is None:
+            return None
+        embedding = vectors[0]
+    else:
+        try:
+            response = client.embeddings.create(
+                model=EMBEDDING_MODEL, input=text, encoding_format="base64"
+            )
+        except Exception as e:
+            print(f"Error getting embedding for semantic cache: {e}")
+            return None
+        embedding = _normalize(response.data[0].embedding)
+
+    _store_embeddings([text], [embedding])
+    return embedding
+
+
+async def aget_embedding(async_client, text: str) -> Optional[np.ndarray]:
+    """Async variant of get_embedding using an AsyncOpenAI client."""
+    key = _text_key(text)
+    cached = _cached_embedding(key)
+    if cached is not None:
+        return cached
+
+    # Model loading and inference are CPU-bound, keep them off the event loop
+    embedder = (
+        await asyncio.to_thread(_local_embedder)
+        if settings.use_local_embeddings
+        else None
+    )
+    if embedder is not None:
+        vectors = await asyncio.to_thread(_embed_locally, embedder, [text])
+        if vectors is None:
+            return None
+        _store_embeddings([text], vectors)
+        return vectors[0]
+
+    try:
+        response = await async_client.embeddings.create(
+            model=EMBEDDING_MODEL, input=text, encoding_format="base64"
+        )
+    except Exception as e:
+        print(f"Error getting embedding for semantic cache: {e}")
+        return None
+
+    embedding = _normalize(response.data[0].embedding)
+    _store_embeddings([text], [embedding])
+    return embedding
+
+
+def _missing_texts(texts: List[str]) -> List[str]:
+    """Unique texts whose embeddings are not cached yet, in input order."""
+    missing = {}
+    with _embedding_cache_lock:
+        for text in texts:
+            key = _text_key(text)
+            if key not in _embedding_cache:
+                missing[key] = text
+    return list(missing.values())
+
+
+def prefetch_embeddings(client, texts: List[str]) -> None:
+    """
+    Embed all uncached texts with batched requests using a sync OpenAI client.
+
+    Later get_embedding calls for these texts are served from the cache, so a
+    batch of entries costs one embeddings request per EMBEDDING_BATCH_SIZE
+    texts instead of one per entry.
+    """
+    missing = _missing_texts(texts)
+    embedder = _local_embedder()
+    for start in range(0, len(missing), EMBEDDING_BATCH_SIZE):
+        chunk = missing[start : start + EMBEDDING_BATCH_SIZE]
+        if embedder is not None:
+            vectors = _embed_locally(embedder, chunk)
+            if vectors is None:
+                return
+            _store_embeddings(chunk, vectors)
+            continue
+
+        try:
+            response = client.embeddings.create(
+                model=EMBEDDING_MODEL, input=chunk, encoding_format="base64"
+            )
+        except Exception as e:
+            print(f"Error prefetching embeddings for semantic cache: {e}")
+            return
+        _store_embeddings(chunk, (_normalize(d.embedding) for d in response.data))
+
+
+async def aprefetch_embeddings(async_client, texts: List[str]) -> None:
+    """Async variant of prefetch_embeddings using an AsyncOpenAI client."""
+    if (
+        settings.use_local_embeddings
+        and await asyncio.to_thread(_local_embedder) is not None
+    ):
+        # Runs the local model in a worker thread; the OpenAI client is unused
+        await asyncio.to_thread(prefetch_embeddings, None, texts)
+        return
+
+    missing = _missing_texts(texts)
+    for start in range(0, len(missing), EMBEDDING_BATCH_SIZE):
+        chunk = missing[start : start + EMBEDDING_BATCH_SIZE]
+        try:
+            response = await async_client.embeddings.create(
+                model=EMBEDDING_MODEL, input=chunk, encoding_format="base64"
+            )
+        except Exception as e:
+            print(f"Error prefetching embeddings for semantic cache: {e}")
+            return
+        _store_embeddings(chunk, (_normalize(d.embedding) for d in response.data))
+
+
+def _similarities(keys: np.ndarray, embedding: np.ndarray) -> np.ndarray:
+    """Cosine similarity of an embedding to every row of keys."""
+    if simsimd is not None:
+        distances = simsimd.cdist(embedding.reshape(1, -1), keys, metric="cosine")
+        return 1.0 - np.asarray(distances, dtype=np.float32).ravel()
+    # Rows and embedding are unit length, so the dot product is the cosine
+    return keys @ embedding
+
+
+class SemanticCache:
+    """
+    Nearest-neighbour cache of results keyed by normalized embeddings.
+
+    Every row belongs to an owner and lookups only match rows of the same owner,
+    so results derived from one user's entry are never served to another user.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        max_entries: int = 5000,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # Preallocated (max_entries, dim) matrix of unit-length rows, filled as a
+        # ring buffer so adding an entry never copies the whole matrix
+        self._keys: Optional[np.ndarray] = None
+        self._values: List[Any] = [None] * max_entries
+        # Monotonic insertion time of each row, for TTL expiry
+        self._added_at = np.zeros(max_entries, dtype=np.float64)
+        # Owner of each row, as a small integer id assigned per distinct owner
+        self._owners = np.full(max_entries, -1, dtype=np.int64)
+        self._owner_ids: Dict[Hashable, int] = {}
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def lookup(
+        self, embedding: Optional[np.ndarray], owner: Hashable = None
+    ) -> Optional[Any]:
+        """Return the owner's closest cached value above the threshold."""
+        if embedding is None:
+            return None
+
+        with self._lock:
+            owner_id = self._owner_ids.get(owner)
+            if owner_id is None:
+                return None
+            rows = np.flatnonzero(self._owners[: self._size] == owner_id)
+            if self.ttl_seconds is not None:
+                rows = rows[self._added_at[rows] >= time.monotonic() - self.ttl_seconds]
+            if rows.size == 0:
+                return None
+            scores = _similarities(self._keys[rows], embedding)
+            best = int(scores.argmax())
+            if scores[best] >= self.threshold:
+                return self._values[rows[best]]
+        return None
+
+    def add(self, embedding: np.ndarray, value: Any, owner: Hashable = None) -> None:
+        """Store a value, overwriting the oldest entry once max_entries is reached."""
+        with self._lock:
+            if self._keys is None:
+                self._keys = np.empty(
+                    (self.max_entries, embedding.shape[0]), dtype=np.float32
+                )
+            owner_id = self._owner_ids.setdefault(owner, len(self._owner_ids))
+            self._keys[self._next] = embedding
+            self._values[self._next] = value
+            self._added_at[self._next] = time.monotonic()
+            self._owners[self._next] = owner_id
+            self._next = (self._next + 1) % self.max_entries
+            self._size = min(self._size + 1, self.max_entries)
+
+
+# Global cache instances. Sentiment scores carry no entry text and are shared by
+# all users; entry analyses include model-written themes and are kept per user.
+sentiment_semantic_cache = SemanticCache(
+    threshold=settings.semantic_cache_threshold,
+    max_entries=settings.semantic_cache_max_entries,
+    ttl_seconds=settings.semantic_cache_ttl_seconds,
+)
+analysis_semantic_cache = SemanticCache(
+    threshold=settings.semantic_cache_threshold,
+    max_entries=settings.semantic_cache_max_entries,
+    ttl_seconds=settings.semantic_cache_ttl_seconds,
+)
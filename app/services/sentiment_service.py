@@ -1,58 +1,78 @@
-import json
+import re
 import openai
+import orjson
+from typing import Optional
 from app.core.config import settings
+from app.services.openai_client import shared_client, shared_sync_client
+from app.services.llm_cache import llm_cache
+from app.services.semantic_cache import (
+    aget_embedding,
+    get_embedding,
+    sentiment_semantic_cache,
+)
+
+# Scoring scale and guidelines, shared with the combined entry analyzer
+SENTIMENT_SCORING_GUIDE = """## Scoring Scale (-2.00 to +2.00, 2 decimal places)
+-2.00..-1.75 crisis, hopelessness | -1.74..-1.25 strong sadness, anger | -1.24..-0.75 disappointment, worry | -0.74..-0.25 minor concerns | -0.24..-0.01 hint of negativity
+0.00 neutral, factual
++0.01..+0.24 hint of positivity | +0.25..+0.74 mild contentment | +0.75..+1.24 happiness, gratitude | +1.25..+1.74 joy, excitement | +1.75..+2.00 elation
+
+Judge the overall tone in any language, including mixed feelings and cultural differences in expression. Use the full decimal range (e.g. -1.37, +0.82, -0.15), not steps of 0.5.
+
+Examples: "Не вижу смысла ни в чём, всё рушится" -> -1.86; "Nice walk with my sister, felt calm" -> 0.68"""
+
+# Matches a complete score in a partially streamed JSON response; the trailing
+# character guarantees the number is no longer growing
+_SCORE_RE = re.compile(r'"sentiment_score"\s*:\s*(-?\d+(?:\.\d+)?)[^\d.]')
+
+# Structured output schema, so the model can only return a well-formed score
+SENTIMENT_SCHEMA = {
+    "name": "sentiment",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "sentiment_score": {"type": "number", "minimum": -2, "maximum": 2}
+        },
+        "required": ["sentiment_score"],
+        "additionalProperties": False,
+    },
+}
+
+# System prompt is built once and kept byte-identical across calls
+_SYSTEM_PROMPT = (
+    """You are an expert multilingual sentiment analyst of diary entries. Rate the sentiment of the text.
+
+"""
+    + SENTIMENT_SCORING_GUIDE
+    + """
+
+Respond with ONLY {"sentiment_score": <float>}"""
+)
 
 
 class MultilingualSentimentAnalyzer:
     """Sentiment analyzer using GPT-4o-mini for accurate multilingual sentiment analysis"""
 
-    def __init__(self):
-        self.client = openai.OpenAI(api_key=settings.openai_api_key)
+    def __init__(
+        self,
+        client: Optional[openai.OpenAI] = None,
+        async_client: Optional[openai.AsyncOpenAI] = None,
+    ):
+        self.client = client or shared_sync_client
+        self.async_client = async_client or shared_client
         self.model = "gpt-4o-mini"
 
     def _get_system_prompt(self) -> str:
         """
-        Create a system prompt using proven prompt engineering techniques:
+        Get the system prompt, built using proven prompt engineering techniques:
         - Role assignment (expert sentiment analyst)
         - Clear task definition
         - Output format specification
         - Structured guidelines with examples
         - Calibration anchors for consistent scoring
         """
-        return """You are an expert multilingual sentiment analyst specializing in analyzing emotional content from personal diary and journal entries.
-
-Your task is to analyze the sentiment of the provided text and return a precise numerical score with exactly 2 decimal places.
-
-## Scoring Scale
-Return a floating-point number from -2.00 to +2.00 with 2 decimal places precision:
-
-**Negative Range (-2.00 to -0.01):**
-- -2.00 to -1.75: Extremely negative (severe distress, hopelessness, crisis)
-- -1.74 to -1.25: Very negative (strong sadness, anger, frustration)
-- -1.24 to -0.75: Moderately negative (disappointment, worry, mild sadness)
-- -0.74 to -0.25: Slightly negative (minor concerns, subtle unease)
-- -0.24 to -0.01: Barely negative (hint of negativity, minor dissatisfaction)
-
-**Neutral:**
-- 0.00: Perfectly neutral (factual, balanced, no emotion)
-
-**Positive Range (+0.01 to +2.00):**
-- +0.01 to +0.24: Barely positive (hint of positivity, minor satisfaction)
-- +0.25 to +0.74: Slightly positive (mild contentment, small pleasures)
-- +0.75 to +1.24: Moderately positive (happiness, satisfaction, gratitude)
-- +1.25 to +1.74: Very positive (joy, excitement, strong enthusiasm)
-- +1.75 to +2.00: Extremely positive (elation, profound joy, peak happiness)
-
-## Analysis Guidelines
-1. **Language Independence**: Analyze sentiment accurately regardless of the language used
-2. **Context Awareness**: Consider the overall tone, not just individual words
-3. **Nuance Detection**: Capture subtle emotional expressions and mixed feelings
-4. **Cultural Sensitivity**: Account for cultural differences in emotional expression
-5. **Fine-Grained Precision**: Use the full range of decimal values (e.g., -1.37, +0.82, -0.15, +1.63) to capture nuanced emotional intensity. Avoid rounding to simple increments like 0.5.
-
-## Response Format
-Respond with ONLY a valid JSON object containing the score with exactly 2 decimal places:
-{"sentiment_score": <float between -2.00 and 2.00 with 2 decimal places>}"""
+        return _SYSTEM_PROMPT
 
     def _get_user_prompt(self, text: str) -> str:
         """Create the user prompt with the text to analyze"""
@@ -65,41 +85,127 @@ Text to analyze:
 
 Return your analysis as a JSON object with the sentiment_score."""
 
+    def request_kwargs(self, text: str) -> dict:
+        """Build the chat completion request for a single text"""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self._get_system_prompt()},
+                {"role": "user", "content": self._get_user_prompt(text)},
+            ],
+            "response_format": {"type": "json_schema", "json_schema": SENTIMENT_SCHEMA},
+            "temperature": 0.1,  # Low temperature for consistent, deterministic results
+            "max_tokens": 50,  # Only need a small response
+        }
+
+    def _read_score_stream(self, stream) -> str:
+        """Read a streamed response until the score is complete, then stop it early"""
+        buf = ""
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                buf += chunk.choices[0].delta.content or ""
+                match = _SCORE_RE.search(buf)
+                if match:
+                    return f'{{"sentiment_score": {match.group(1)}}}'
+        finally:
+            stream.close()
+        return buf
+
+    async def _aread_score_stream(self, stream) -> str:
+        """Async variant of _read_score_stream"""
+        buf = ""
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                buf += chunk.choices[0].delta.content or ""
+                match = _SCORE_RE.search(buf)
+                if match:
+                    return f'{{"sentiment_score": {match.group(1)}}}'
+        finally:
+            await stream.close()
+        return buf
+
+    def _parse_score(self, response_content: str) -> float:
+        """Parse and validate the sentiment score from the model's JSON response"""
+        result = orjson.loads(response_content)
+
+        try:
+            sentiment_score = float(result["sentiment_score"])
+        except (KeyError, TypeError, ValueError):
+            print(f"Invalid sentiment_score in response: {response_content}")
+            return 0.0
+
+        # Clamp the score to valid range [-2, 2]
+        return round(min(2.0, max(-2.0, sentiment_score)), 2)
+
     def analyze_sentiment_sync(self, text: str) -> float:
         """Analyze sentiment of text synchronously using GPT-4o-mini"""
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self._get_system_prompt()},
-                    {"role": "user", "content": self._get_user_prompt(text)},
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.1,  # Low temperature for consistent, deterministic results
-                max_tokens=50,  # Only need a small response
-            )
-
-            # Parse the JSON response
-            response_content = response.choices[0].message.content.strip()
-            result = json.loads(response_content)
-
-            # Extract and validate the sentiment score
-            raw_score = result.get("sentiment_score")
-            if raw_score is None:
-                return 0.0
-
-            try:
-                sentiment_score = float(raw_score)
-            except (ValueError, TypeError):
-                print(f"Invalid sentiment_score value: {raw_score}")
-                return 0.0
-
-            # Clamp the score to valid range [-2, 2]
-            sentiment_score = max(-2.0, min(2.0, sentiment_score))
-
-            return round(sentiment_score, 2)
-
-        except json.JSONDecodeError as e:
+            request = self.request_kwargs(text)
+            cache_key = llm_cache.make_key(request)
+            response_content = llm_cache.get(cache_key)
+            embedding = None
+            if response_content is None:
+                if settings.semantic_cache_enabled:
+                    embedding = get_embedding(self.client, text)
+                    cached_score = sentiment_semantic_cache.lookup(embedding)
+                    if cached_score is not None:
+                        return cached_score
+
+                stream = self.client.chat.completions.create(**request, stream=True)
+                response_content = self._read_score_stream(stream)
+
+            sentiment_score = self._parse_score(response_content)
+            llm_cache.set(cache_key, response_content)
+            if embedding is not None:
+                sentiment_semantic_cache.add(embedding, sentiment_score)
+            return sentiment_score
+
+        except orjson.JSONDecodeError as e:
+            print(f"Error parsing JSON response from OpenAI: {e}")
+            return 0.0  # Return neutral on parse error
+        except Exception as e:
+            print(f"Error in sentiment analysis: {e}")
+            return 0.0  # Return neutral on any error
+
+    async def analyze_sentiment_or_raise(
+        self, text: str, client: Optional[openai.AsyncOpenAI] = None
+    ) -> float:
+        """
+        Analyze sentiment of text asynchronously, raising on any error.
+
+        client overrides self.async_client, e.g. with one that doesn't retry.
+        """
+        client = client or self.async_client
+        request = self.request_kwargs(text)
+        cache_key = llm_cache.make_key(request)
+        response_content = llm_cache.get(cache_key)
+        embedding = None
+        if response_content is None:
+            if settings.semantic_cache_enabled:
+                embedding = await aget_embedding(client, text)
+                cached_score = sentiment_semantic_cache.lookup(embedding)
+                if cached_score is not None:
+                    return cached_score
+
+            stream = await client.chat.completions.create(**request, stream=True)
+            response_content = await self._aread_score_stream(stream)
+
+        sentiment_score = self._parse_score(response_content)
+        llm_cache.set(cache_key, response_content)
+        if embedding is not None:
+            sentiment_semantic_cache.add(embedding, sentiment_score)
+        return sentiment_score
+
+    async def analyze_sentiment(self, text: str) -> float:
+        """Analyze sentiment of text asynchronously using GPT-4o-mini"""
+        try:
+            return await self.analyze_sentiment_or_raise(text)
+
+        except orjson.JSONDecodeError as e:
             print(f"Error parsing JSON response from OpenAI: {e}")
             return 0.0  # Return neutral on parse error
         except Exception as e:
@@ -2,8 +2,12 @@
 Webkassa.kz payment gateway integration service.
 """
 
+import httpx
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any
+from urllib3.util import Retry
 from app.core.config import settings
 
 
@@ -15,6 +19,46 @@ class WebkassaService:
         self.api_key = settings.webkassa_api_key
         self.cashbox_id = settings.webkassa_cashbox_id
 
+        # Per-process constants, built once instead of on every request
+        self._return_url = f"{settings.frontend_url}/payment/success"
+        self._cancel_url = f"{settings.frontend_url}/payment/cancel"
+        self._create_order_url = f"{self.api_url}/orders/create"
+        self._issue_receipt_url = f"{self.api_url}/receipts/issue"
+
+        # Pooled keep-alive connections; only idempotent requests are retried
+        self._session = requests.Session()
+        self._session.headers["Authorization"] = f"Bearer {self.api_key}"
+        # Bodies are serialized with orjson, so the JSON content type is set here
+        self._session.headers["Content-Type"] = "application/json"
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=50,
+            max_retries=Retry(
+                total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]
+            ),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        # Async client for callers running on the event loop
+        self._aclient = httpx.AsyncClient(
+            timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20),
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            },
+        )
+
+    def close(self) -> None:
+        """Close pooled connections to Webkassa.kz"""
+        self._session.close()
+
+    async def aclose(self) -> None:
+        """Close pooled connections of the async client"""
+        await self._aclient.aclose()
+
     def create_payment_order(
         self,
         amount: float,
@@ -37,30 +81,15 @@ class WebkassaService:
         Raises:
             requests.RequestException: If API request fails
         """
-        payload = {
-            "cashbox_id": self.cashbox_id,
-            "order_id": order_id,
-            "amount": amount,
-            "currency": "KZT",
-            "description": f"Подписка {plan_name} - Moodlog",
-            "customer_email": user_email,
-            "return_url": f"{settings.frontend_url}/payment/success",
-            "cancel_url": f"{settings.frontend_url}/payment/cancel",
-        }
+        payload = self._order_payload(amount, user_email, plan_name, order_id)
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-
-        response = requests.post(
-            f"{self.api_url}/orders/create",
-            json=payload,
-            headers=headers,
+        response = self._session.post(
+            self._create_order_url,
+            data=orjson.dumps(payload),
             timeout=30,
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
     def check_payment_status(self, order_id: str) -> Dict[str, Any]:
         """
@@ -75,17 +104,12 @@ class WebkassaService:
         Raises:
             requests.RequestException: If API request fails
         """
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-        }
-
-        response = requests.get(
+        response = self._session.get(
             f"{self.api_url}/orders/{order_id}/status",
-            headers=headers,
             timeout=30,
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
     def issue_fiscal_receipt(
         self,
@@ -108,27 +132,92 @@ class WebkassaService:
         Raises:
             requests.RequestException: If API request fails
         """
-        payload = {
+        payload = self._receipt_payload(order_id, amount, user_email)
+
+        response = self._session.post(
+            self._issue_receipt_url,
+            data=orjson.dumps(payload),
+            timeout=30,
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def acreate_payment_order(
+        self,
+        amount: float,
+        user_email: str,
+        plan_name: str,
+        order_id: str,
+    ) -> Dict[str, Any]:
+        """
+        Async variant of create_payment_order.
+
+        Raises:
+            httpx.HTTPError: If API request fails
+        """
+        response = await self._aclient.post(
+            self._create_order_url,
+            content=orjson.dumps(
+                self._order_payload(amount, user_email, plan_name, order_id)
+            ),
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def acheck_payment_status(self, order_id: str) -> Dict[str, Any]:
+        """
+        Async variant of check_payment_status.
+
+        Raises:
+            httpx.HTTPError: If API request fails
+        """
+        response = await self._aclient.get(f"{self.api_url}/orders/{order_id}/status")
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def aissue_fiscal_receipt(
+        self,
+        order_id: str,
+        amount: float,
+        user_email: str,
+    ) -> Dict[str, Any]:
+        """
+        Async variant of issue_fiscal_receipt.
+
+        Raises:
+            httpx.HTTPError: If API request fails
+        """
+        response = await self._aclient.post(
+            self._issue_receipt_url,
+            content=orjson.dumps(self._receipt_payload(order_id, amount, user_email)),
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    def _order_payload(
+        self, amount: float, user_email: str, plan_name: str, order_id: str
+    ) -> Dict[str, Any]:
+        return {
             "cashbox_id": self.cashbox_id,
             "order_id": order_id,
             "amount": amount,
+            "currency": "KZT",
+            "description": f"Подписка {plan_name} - Moodlog",
             "customer_email": user_email,
+            "return_url": self._return_url,
+            "cancel_url": self._cancel_url,
         }
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
+    def _receipt_payload(
+        self, order_id: str, amount: float, user_email: str
+    ) -> Dict[str, Any]:
+        return {
+            "cashbox_id": self.cashbox_id,
+            "order_id": order_id,
+            "amount": amount,
+            "customer_email": user_email,
         }
 
-        response = requests.post(
-            f"{self.api_url}/receipts/issue",
-            json=payload,
-            headers=headers,
-            timeout=30,
-        )
-        response.raise_for_status()
-        return response.json()
-
 
 # Global service instance
 webkassa_service = WebkassaService()